@@ -1,31 +1,17 @@
 #!/bin/bash
 # Obsidian自動同期スクリプト
 # GitHubから最新の記事を取得してObsidianに同期
+# SYNC_MODE=sparse で記事テキストだけを取得するスパースモード
+# ログ出力・ローテーション・古いログの削除は obsidian_sync_runner.py が行う
+# （~/.logs/relationship-blog/sync_YYYY-MM-DD.jsonl）
 
-LOG_DIR="$HOME/.logs/relationship-blog"
-LOG_FILE="$LOG_DIR/sync_$(date +%Y-%m-%d).log"
 PROJECT_DIR="/Users/keiji/Desktop/開発/relationship-blog"
 
-# ログディレクトリ作成
-mkdir -p "$LOG_DIR"
-
-echo "======================================" >> "$LOG_FILE"
-echo "📅 $(date '+%Y-%m-%d %H:%M:%S')" >> "$LOG_FILE"
-echo "======================================" >> "$LOG_FILE"
-
 # プロジェクトディレクトリに移動
 cd "$PROJECT_DIR" || exit 1
 
-# 最新の変更を取得
-echo "📥 Git pull実行中..." >> "$LOG_FILE"
-git pull origin main >> "$LOG_FILE" 2>&1
-
-# Obsidianに同期
-echo "📚 Obsidianに同期中..." >> "$LOG_FILE"
-/usr/bin/python3 scripts/sync_to_obsidian.py >> "$LOG_FILE" 2>&1
-
-echo "✅ 完了" >> "$LOG_FILE"
-echo "" >> "$LOG_FILE"
-
-# 古いログを削除（30日以上）
-find "$LOG_DIR" -name "sync_*.log" -mtime +30 -delete
+if [ "$SYNC_MODE" = "sparse" ]; then
+    exec /usr/bin/python3 scripts/obsidian_sync_runner.py --sparse > /dev/null
+else
+    exec /usr/bin/python3 scripts/obsidian_sync_runner.py > /dev/null
+fi
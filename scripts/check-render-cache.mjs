@@ -0,0 +1,42 @@
+// レンダリングキャッシュ（scripts/render_cache.py）のHTMLが
+// src/lib/posts.ts の remark + remark-html の出力と一致するか確認する
+// （見出しの id 属性はキャッシュだけが付けるので除いて比較）
+//
+// 使い方: npm run check:render-cache
+import fs from 'fs';
+import path from 'path';
+import matter from 'gray-matter';
+import { remark } from 'remark';
+import html from 'remark-html';
+
+const postsDirectory = path.join(process.cwd(), 'content/posts');
+const renderCacheDirectory = path.join(process.cwd(), 'content/cache/render');
+
+const manifest = JSON.parse(fs.readFileSync(path.join(postsDirectory, 'manifest.json'), 'utf8')).posts;
+let checked = 0;
+let mismatched = 0;
+
+for (const [slug, entry] of Object.entries(manifest).sort()) {
+  const cachePath = path.join(renderCacheDirectory, `${slug}.json`);
+  if (!fs.existsSync(cachePath)) {
+    continue;
+  }
+  const cache = JSON.parse(fs.readFileSync(cachePath, 'utf8'));
+  if (cache.html == null) {
+    continue;
+  }
+
+  const { content } = matter(fs.readFileSync(path.join(postsDirectory, entry.path), 'utf8'));
+  const expected = (await remark().use(html).process(content)).toString();
+  const actual = cache.html.replace(/<(h[1-6]) id="[^"]*">/g, '<$1>');
+  checked += 1;
+  if (actual !== expected) {
+    mismatched += 1;
+    const index = [...expected].findIndex((ch, i) => ch !== actual[i]);
+    console.log(`❌ ${slug}: ${JSON.stringify(expected.slice(Math.max(0, index - 40), index + 40))}`);
+    console.log(`   cache: ${JSON.stringify(actual.slice(Math.max(0, index - 40), index + 40))}`);
+  }
+}
+
+console.log(`${checked}件を比較、不一致 ${mismatched}件`);
+process.exit(mismatched ? 1 : 0);
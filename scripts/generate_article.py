@@ -1,295 +1,157 @@
 #!/usr/bin/env python3
 """
 ブログ記事自動生成スクリプト
-- 3カテゴリ対応: 人間関係、健康、運動
+- サイト・カテゴリ・プロンプトは scripts/sites/*.json で定義（既定: ennek.json）
+- 複数サイトを同時に生成（APIクライアント・接続プール・レート制限は共有、
+  履歴・画像・記事の出力先はサイトごと）
 - 5000〜6000字の実用的な記事（2パート生成方式）
-- 日付ベースのローテーション
-- Unsplash無料画像
+- 日付ベースのローテーション（テーマは重複しない巡回スケジュール）
+- Unsplash無料画像（知覚ハッシュで重複画像を回避）
 - 重複防止機能（4層チェック）
 - Obsidian自動投稿機能
+- 実行結果をDiscordに通知（バックグラウンドで送信）
+- 保存時にレンダリングキャッシュ（HTML・目次）を生成
 """
 
 import os
 import sys
 import json
 import hashlib
+import time
+import argparse
+import threading
 import requests
-import random
+import requests.adapters
 from datetime import datetime, timedelta
 from pathlib import Path
 from openai import OpenAI
 from difflib import SequenceMatcher
-
-# プロジェクトルート
+from concurrent.futures import ThreadPoolExecutor
+
+from site_config import DEFAULT_SITE, SiteConfig, check_sites, load_site, load_all_sites
+from render_cache import update_render_cache
+from post_store import post_path, record_post
+from image_index import ImageIndex, compute_hashes, hashing_available
+from image_store import store_image, record_image, public_path
+from theme_scheduler import ThemeScheduler
+from generation_stats import CONTEXT_WINDOW, GenerationStats, TokenCounter, scale_targets
+from notifications import DiscordNotifier, success_embed, failure_embed
+from pipeline_logging import LOG_DIR, get_logger, setup_logging, log_stage
+from pipeline_profiling import add_profile_argument, enable_profiling_from_args
+
+logger = get_logger("generate")
+
+# サイト設定（scripts/sites/*.json）
+# 既定サイトの値はモジュール定数としても参照できるようにしておく
 PROJECT_ROOT = Path(__file__).parent.parent
-POSTS_DIR = PROJECT_ROOT / "content" / "posts"
-IMAGES_DIR = PROJECT_ROOT / "public" / "images"
-HISTORY_FILE = PROJECT_ROOT / "scripts" / "post_history.json"
+POSTS_DIR = DEFAULT_SITE.posts_dir
+IMAGES_DIR = DEFAULT_SITE.images_dir
+HISTORY_FILE = DEFAULT_SITE.history_file
+
+# 重複画像を避けるためのUnsplash再取得回数
+MAX_IMAGE_ATTEMPTS = 3
+
+# 記事生成に使うモデル
+OPENAI_MODEL = "gpt-4o-mini"
+
+# プロンプトで指示する文字数（セクションごと・合計、実績に応じて補正される）
+LENGTH_TARGETS = {
+    "part1": {"sections": (600, 700, 800, 800), "total": 3000},
+    "part2": {"sections": (800, 600, 600, 500), "total": 2500},
+}
+
+# 複数サイトで共有するAPIの同時実行数と呼び出し間隔（秒）
+OPENAI_CONCURRENCY = 4
+OPENAI_MIN_INTERVAL = 0.2
+UNSPLASH_CONCURRENCY = 2
+UNSPLASH_MIN_INTERVAL = 1.0
 
 # ブログURL（本番サイト）
-BLOG_URL = "https://ennekrelationship.netlify.app"
+BLOG_URL = DEFAULT_SITE.blog_url
 
 # Obsidian Vaultのパス
-OBSIDIAN_VAULT_PATH = Path("/Users/keiji/Desktop/Obsidian/06_blog")
-
-
-# =============================================================================
-# カテゴリ定義
-# =============================================================================
-
-CATEGORIES = {
-    "relationship": {
-        "name": "人間関係",
-        "tag": "人間関係",
-        "image_keywords": "people connection communication friendship",
-        "themes": [
-            "職場の人間関係を円滑にするコミュニケーション術",
-            "苦手な人との上手な付き合い方",
-            "信頼関係を築くための基本原則",
-            "パートナーとの関係を深める秘訣",
-            "友人関係を長続きさせる方法",
-            "家族間のコミュニケーション改善法",
-            "初対面での印象を良くするテクニック",
-            "断り方の極意：相手を傷つけない伝え方",
-            "怒りのコントロールと人間関係",
-            "傾聴スキルで人間関係を改善する",
-            "自己主張と協調性のバランス",
-            "SNS時代の人間関係の築き方",
-            "世代間ギャップを乗り越えるコツ",
-            "嫉妬心との向き合い方",
-            "人間関係のストレス解消法",
-            "マインドフルネスで人間関係を改善",
-            "境界線の引き方：健全な関係を保つ",
-            "許す力：過去の傷を癒す方法",
-            "共感力を高めるトレーニング",
-            "非言語コミュニケーションの重要性",
-            "価値観の違いを受け入れる心の持ち方",
-            "人見知りを克服する実践テクニック",
-            "リモートワーク時代の人間関係構築",
-            "上司との良好な関係を築く方法",
-            "部下のモチベーションを高める接し方",
-            "ママ友・パパ友との付き合い方",
-            "近所付き合いのコツと距離感",
-            "義家族との関係を良好に保つ秘訣",
-            "別れと新しい出会いへの向き合い方",
-            "孤独感を和らげる人とのつながり方",
-            "批判への上手な対処法",
-            "謝罪と和解のテクニック",
-            "感謝の気持ちを伝える効果",
-            "相手の立場に立って考える力",
-            "人間関係における自己肯定感の重要性",
-            "グループ内での立ち位置の見つけ方",
-            "競争と協力のバランス",
-            "秘密を守る信頼の築き方",
-            "噂話との向き合い方",
-            "人間関係のリセット：新しいスタート",
-            "内向的な人の強みを活かす人間関係",
-            "外向的な人との上手な付き合い方",
-            "完璧主義と人間関係の問題",
-            "依存関係から抜け出す方法",
-            "健全な距離感の保ち方",
-            "対立を建設的に解決する方法",
-            "チームワークを高めるコミュニケーション",
-            "メンタルヘルスと人間関係",
-            "自分らしさを保ちながら人と繋がる",
-            "人間関係の疲れを癒す方法",
-        ],
-        "system_prompt": """あなたは人間関係の専門家であり、プロのブログライターです。
-心理学や行動科学の研究に基づいた、実用的で科学的根拠のある記事を書いてください。
-
-【文体】
-- 親しみやすく、温かみのある「です・ます」調
-- 読者に直接語りかける表現（「あなたは〜」「〜ですよね」）
-
-【必須要素】
-- 具体的な会話例を含める
-- 「良い例」と「悪い例」の比較
-- 心理学や研究の引用（例：「〇〇大学の研究によると...」）
-
-見出しはMarkdown形式（## と ###）で書いてください。"""
-    },
-    "health": {
-        "name": "健康",
-        "tag": "健康",
-        "image_keywords": "health wellness nutrition healthy lifestyle",
-        "themes": [
-            "睡眠の質を高める科学的な方法",
-            "腸内環境と免疫力の関係",
-            "ストレスホルモンを下げる生活習慣",
-            "集中力を高める食事と栄養素",
-            "認知機能を維持するための習慣",
-            "炎症を抑える食生活",
-            "自律神経を整える科学的アプローチ",
-            "疲労回復のメカニズムと対策",
-            "アンチエイジングの科学",
-            "血糖値コントロールと健康",
-            "水分摂取の重要性と最適な方法",
-            "ビタミンDと健康の深い関係",
-            "オメガ3脂肪酸の効果と摂り方",
-            "断食・ファスティングの科学",
-            "カフェインの効果と最適な摂取タイミング",
-            "腸脳相関：腸が脳に与える影響",
-            "睡眠負債を解消する方法",
-            "概日リズムを整える習慣",
-            "デジタルデトックスの健康効果",
-            "瞑想が脳と体に与える影響",
-            "呼吸法で自律神経を整える",
-            "姿勢と健康の関係",
-            "眼精疲労を防ぐ科学的対策",
-            "冷え性改善の科学",
-            "サウナと健康の関係",
-            "入浴の科学：最適な温度と時間",
-            "朝の習慣と健康",
-            "夜の習慣と睡眠の質",
-            "食物繊維の重要性",
-            "発酵食品の健康効果",
-            "抗酸化物質と老化防止",
-            "タンパク質の最適な摂取量",
-            "砂糖が体に与える影響",
-            "アルコールと健康の真実",
-            "免疫力を高める生活習慣",
-            "慢性疲労を克服する方法",
-            "頭痛を予防する生活習慣",
-            "肩こり・腰痛の科学的対策",
-            "目の健康を守る習慣",
-            "歯と全身の健康の関係",
-            "ホルモンバランスを整える方法",
-            "更年期を健やかに過ごす科学",
-            "長寿の科学：ブルーゾーンの教え",
-            "ミトコンドリアを活性化する方法",
-            "テロメアと老化の関係",
-            "ストレスに強い体を作る方法",
-            "季節の変わり目の健康管理",
-            "花粉症を軽減する科学的アプローチ",
-            "食事のタイミングと健康",
-            "マインドフルイーティングの効果",
-        ],
-        "system_prompt": """あなたは健康科学の専門家であり、プロのブログライターです。
-最新の医学研究や栄養学に基づいた、実用的で科学的根拠のある記事を書いてください。
-
-【文体】
-- 親しみやすく、温かみのある「です・ます」調
-- 読者に直接語りかける表現
-
-【必須要素】
-- 具体的な実践方法を含める
-- 科学的研究の引用（例：「〇〇大学の研究によると...」「〇〇ジャーナルに掲載された論文では...」）
-- 数値やデータを活用（例：「〇〇%改善した」「〇〇分間行うと効果的」）
-- 注意点や個人差についても言及
-
-見出しはMarkdown形式（## と ###）で書いてください。"""
-    },
-    "exercise": {
-        "name": "運動",
-        "tag": "運動",
-        "image_keywords": "fitness exercise workout training sports",
-        "themes": [
-            "HIITトレーニングの科学的効果",
-            "筋トレと脳機能の関係",
-            "有酸素運動と心臓健康",
-            "柔軟性を高めるストレッチの科学",
-            "座りすぎのリスクと対策",
-            "最適な運動頻度と時間",
-            "運動とメンタルヘルスの関係",
-            "効率的な脂肪燃焼の科学",
-            "運動習慣を継続するコツ",
-            "ウォーキングの健康効果",
-            "ランニングの正しいフォームと効果",
-            "スクワットの科学：正しいやり方と効果",
-            "プランクの効果を最大化する方法",
-            "体幹トレーニングの科学",
-            "朝運動vs夜運動：最適な時間帯",
-            "運動前後の食事の科学",
-            "筋肉痛のメカニズムと回復法",
-            "オーバートレーニングを防ぐ方法",
-            "休息日の重要性と過ごし方",
-            "加齢と運動：年齢に合った運動法",
-            "女性のための筋トレ科学",
-            "運動と骨密度の関係",
-            "運動と睡眠の質の関係",
-            "運動とホルモンバランス",
-            "運動がストレスを減らすメカニズム",
-            "運動で集中力を高める方法",
-            "運動と創造性の関係",
-            "デスクワーカーのための運動習慣",
-            "自宅でできる効果的エクササイズ",
-            "ヨガの科学的効果",
-            "ピラティスと体幹強化",
-            "水泳の全身運動効果",
-            "サイクリングの健康効果",
-            "階段昇降の意外な効果",
-            "縄跳びの高い運動効果",
-            "ダンスと脳の活性化",
-            "バランストレーニングの重要性",
-            "インターバルトレーニングの効果",
-            "レジスタンストレーニングの基礎",
-            "自重トレーニングの効果と方法",
-            "ダンベルトレーニングの基礎",
-            "運動と免疫力の関係",
-            "運動後のリカバリー術",
-            "動的ストレッチと静的ストレッチ",
-            "ウォームアップの科学",
-            "クールダウンの重要性",
-            "運動と長寿の関係",
-            "運動習慣がもたらす100の効果",
-            "モチベーションを維持する科学",
-            "運動の社会的効果",
-        ],
-        "system_prompt": """あなたは運動科学・スポーツ医学の専門家であり、プロのブログライターです。
-最新のスポーツ科学研究に基づいた、実用的で科学的根拠のある記事を書いてください。
-
-【文体】
-- 親しみやすく、温かみのある「です・ます」調
-- 読者に直接語りかける表現
-
-【必須要素】
-- 具体的なエクササイズ方法を含める（セット数、回数、時間など）
-- 科学的研究の引用（例：「〇〇大学の研究によると...」）
-- 正しいフォームの説明
-- 注意点や怪我予防についても言及
-- 初心者向けの段階的なアドバイス
-
-見出しはMarkdown形式（## と ###）で書いてください。"""
-    }
-}
+OBSIDIAN_VAULT_PATH = DEFAULT_SITE.obsidian_vault_path
 
-# カテゴリの順序（ローテーション用）
-CATEGORY_ORDER = ["relationship", "health", "exercise"]
+# カテゴリ定義・ローテーション順・サブテーマ
+CATEGORIES = DEFAULT_SITE.categories
+CATEGORY_ORDER = DEFAULT_SITE.category_order
+SUB_THEMES = DEFAULT_SITE.sub_themes
 
 
-def get_category_for_date(date: datetime) -> str:
+def get_category_for_date(date: datetime, site: SiteConfig = DEFAULT_SITE) -> str:
     """日付に基づいてカテゴリを決定（ローテーション）"""
-    day_of_year = date.timetuple().tm_yday
-    index = day_of_year % len(CATEGORY_ORDER)
-    return CATEGORY_ORDER[index]
+    return site.category_for_date(date)
+
+
+class RateLimiter:
+    """同時実行数と呼び出し間隔を制限する（スレッド間で共有）"""
+    
+    def __init__(self, concurrency: int, min_interval: float = 0.0):
+        self._semaphore = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._min_interval = min_interval
+        self._next_start = 0.0
+    
+    def __enter__(self):
+        self._semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._min_interval
+        if wait > 0:
+            time.sleep(wait)
+        return self
+    
+    def __exit__(self, *exc):
+        self._semaphore.release()
+        return False
+
+
+class SharedClients:
+    """全サイトで共有するAPIクライアント・接続プール・レート制限"""
+    
+    def __init__(self, pool_size: int = 8):
+        self.openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=3)
+        self.http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.http.mount("https://", adapter)
+        self.openai_limiter = RateLimiter(OPENAI_CONCURRENCY, OPENAI_MIN_INTERVAL)
+        self.unsplash_limiter = RateLimiter(UNSPLASH_CONCURRENCY, UNSPLASH_MIN_INTERVAL)
+    
+    def close(self):
+        self.http.close()
+        self.openai.close()
 
 
 class ArticleGenerator:
-    """記事を生成するクラス（3カテゴリ対応）"""
+    """記事を生成するクラス（1インスタンス = 1サイト）"""
     
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    def __init__(self, site: SiteConfig = DEFAULT_SITE, shared: SharedClients = None):
+        self.site = site
+        self.shared = shared or SharedClients()
+        self.client = self.shared.openai
+        self.http = self.shared.http
         self.unsplash_access_key = os.getenv("UNSPLASH_ACCESS_KEY")
         
         # サブテーマ（バリエーション用）
-        self.sub_themes = [
-            "科学的根拠に基づいたアプローチ",
-            "心理学の視点から解説",
-            "具体的な実践例を交えて",
-            "実践ワークシート付き",
-            "ケーススタディで学ぶ",
-            "専門家の意見を参考に",
-            "最新研究から見る",
-            "日常で使える簡単テクニック",
-            "今日から始められる方法",
-            "長期的な効果を生む習慣",
-        ]
+        self.sub_themes = site.sub_themes
+        self.theme_scheduler = ThemeScheduler.load(
+            site.categories, site.sub_themes, site.theme_schedule_file
+        )
+        
+        # 生成統計（max_tokensと文字数目標の調整用）
+        self.generation_stats = GenerationStats.load(site.generation_stats_file)
+        self.token_counter = TokenCounter(OPENAI_MODEL)
+        
+        # ステージごとの所要時間（秒）と試行回数（通知用）
+        self.timings = {}
+        self.attempts = 0
     
     def load_post_history(self) -> list:
         """投稿履歴を読み込む"""
-        if HISTORY_FILE.exists():
+        if self.site.history_file.exists():
             try:
-                with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+                with open(self.site.history_file, 'r', encoding='utf-8') as f:
                     return json.load(f)
             except:
                 return []
@@ -297,7 +159,8 @@ class ArticleGenerator:
     
     def save_post_history(self, history: list):
         """投稿履歴を保存"""
-        with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
+        self.site.history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.site.history_file, 'w', encoding='utf-8') as f:
             json.dump(history, f, ensure_ascii=False, indent=2)
     
     def is_duplicate(self, title: str, content: str, history: list) -> bool:
@@ -305,7 +168,7 @@ class ArticleGenerator:
         for item in history:
             # 1. 完全一致チェック
             if item.get('title') == title:
-                print(f"⚠️ タイトル完全一致: {title}")
+                logger.warning(f"⚠️ タイトル完全一致: {title}")
                 return True
             
             # 2. タイトル類似度チェック（80%以上で重複）
@@ -313,56 +176,37 @@ class ArticleGenerator:
                 None, title, item.get('title', '')
             ).ratio()
             if title_similarity > 0.8:
-                print(f"⚠️ タイトル類似 ({title_similarity:.1%}): {item.get('title')}")
+                logger.warning(f"⚠️ タイトル類似 ({title_similarity:.1%}): {item.get('title')}")
                 return True
             
             # 3. 冒頭200文字チェック
             content_preview = content[:200]
             if item.get('preview', '')[:200] == content_preview:
-                print(f"⚠️ 冒頭一致")
+                logger.warning(f"⚠️ 冒頭一致")
                 return True
             
             # 4. コンテンツハッシュチェック
             content_hash = hashlib.md5(content.encode()).hexdigest()
             if item.get('hash') == content_hash:
-                print(f"⚠️ コンテンツハッシュ一致")
+                logger.warning(f"⚠️ コンテンツハッシュ一致")
                 return True
         
         return False
     
-    def generate_unique_theme(self, category_key: str, history: list) -> str:
-        """使用していないテーマを選択"""
-        category = CATEGORIES[category_key]
-        themes = category["themes"]
-        
-        # 同じカテゴリの使用済みテーマを取得
-        used_themes = [
-            item.get('theme', '') 
-            for item in history[-100:] 
-            if item.get('category') == category_key
-        ]
-        
-        # 未使用のテーマを探す
-        available_themes = [t for t in themes if t not in used_themes]
-        
-        if not available_themes:
-            # 全て使用済みの場合、ランダムに選択してサブテーマで差別化
-            theme = random.choice(themes)
-            sub = random.choice(self.sub_themes)
-            return f"{theme}（{sub}）"
-        
-        return random.choice(available_themes)
+    def generate_unique_theme(self, category_key: str, history: list, attempt: int = 0) -> str:
+        """使用していないテーマを選択（試行ごとに別の未使用テーマ）"""
+        return self.theme_scheduler.next_theme(category_key, history, skip=attempt)
     
-    def generate_image_from_unsplash(self, theme: str, category_key: str) -> tuple:
-        """Unsplashから関連画像を取得"""
+    def generate_image_from_unsplash(self, theme: str, category_key: str, slug: str = None) -> tuple:
+        """Unsplashから関連画像を取得（内容のハッシュをファイル名にして保存）"""
         if not self.unsplash_access_key:
-            print("⚠️ UNSPLASH_ACCESS_KEYが設定されていません")
+            logger.warning("⚠️ UNSPLASH_ACCESS_KEYが設定されていません")
             return None, None
         
         try:
             # キーワードを英語で生成
             keywords = self._generate_image_keywords(theme, category_key)
-            print(f"🔍 画像検索キーワード: {keywords}")
+            logger.info(f"🔍 画像検索キーワード: {keywords}")
             
             # Unsplash APIで検索
             url = "https://api.unsplash.com/photos/random"
@@ -375,71 +219,165 @@ class ArticleGenerator:
                 "Authorization": f"Client-ID {self.unsplash_access_key}"
             }
             
-            response = requests.get(url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
+            # 既存画像と重複しない写真が出るまで取り直す（本画像のダウンロード前に判定）
+            index = ImageIndex.load(self.site.image_index_file)
+            data = None
+            for _ in range(MAX_IMAGE_ATTEMPTS):
+                with self.shared.unsplash_limiter:
+                    response = self.http.get(url, params=params, headers=headers, timeout=30)
+                response.raise_for_status()
+                candidate = response.json()
+                
+                duplicate = self._find_duplicate_image(candidate, index)
+                if duplicate:
+                    logger.warning(f"⚠️ 既存画像と重複 ({duplicate})、別の画像を取得します...")
+                    continue
+                data = candidate
+                break
+            
+            if data is None:
+                logger.warning("⚠️ 重複しない画像が見つかりませんでした")
+                return None, None
             
-            data = response.json()
             image_url = data.get('urls', {}).get('regular')
             photographer = data.get('user', {}).get('name', 'Unknown')
             photo_link = data.get('links', {}).get('html', '')
             
             if not image_url:
-                print("⚠️ 画像URLが取得できませんでした")
+                logger.warning("⚠️ 画像URLが取得できませんでした")
                 return None, None
             
-            # 画像をダウンロード
-            today = datetime.now().strftime("%Y-%m-%d")
-            filename = f"{today}.jpg"
-            filepath = IMAGES_DIR / filename
-            
-            img_response = requests.get(image_url, timeout=30)
+            # 画像をダウンロード（同じ日に再生成しても既存の画像は上書きしない）
+            img_response = self.http.get(image_url, timeout=30)
             img_response.raise_for_status()
+            filename, sha256 = store_image(img_response.content, self.site.images_dir)
             
-            IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-            with open(filepath, 'wb') as f:
-                f.write(img_response.content)
+            # 画像インデックスと 記事 → 画像 の対応に登録
+            hashes = compute_hashes(img_response.content) if hashing_available() else None
+            index.add(filename, hashes, data.get('id'), sha256)
+            index.save()
+            record_image(
+                slug or datetime.now().strftime("%Y-%m-%d"), filename, sha256,
+                self.site.image_manifest_file,
+            )
             
-            print(f"✓ 画像を保存しました: {filepath}")
-            print(f"📷 Photo by {photographer} on Unsplash")
+            logger.info(f"✓ 画像を保存しました: {self.site.images_dir / filename}")
+            logger.info(f"📷 Photo by {photographer} on Unsplash")
             
-            return f"/images/{filename}", {
+            return public_path(filename), {
                 "photographer": photographer,
                 "link": photo_link
             }
             
         except Exception as e:
-            print(f"⚠️ Unsplash画像取得エラー: {e}")
+            logger.warning(f"⚠️ Unsplash画像取得エラー: {e}")
             return None, None
     
+    def _find_duplicate_image(self, photo: dict, index: ImageIndex) -> str:
+        """Unsplashの写真が既存画像と重複していれば、その画像名を返す"""
+        photo_id = photo.get('id')
+        if index.has_photo(photo_id):
+            return f"写真ID {photo_id}"
+        
+        # サムネイル（数KB）だけで知覚ハッシュを比較
+        thumb_url = photo.get('urls', {}).get('thumb')
+        if not thumb_url or not hashing_available():
+            return None
+        try:
+            thumb_response = self.http.get(thumb_url, timeout=30)
+            thumb_response.raise_for_status()
+            return index.find_similar(compute_hashes(thumb_response.content))
+        except Exception as e:
+            logger.warning(f"⚠️ サムネイル判定エラー: {e}")
+            return None
+    
     def _generate_image_keywords(self, theme: str, category_key: str) -> str:
         """テーマから英語のキーワードを生成"""
-        category = CATEGORIES[category_key]
+        category = self.site.categories[category_key]
         base_keywords = category["image_keywords"]
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"Generate 2-3 English keywords for stock photo search based on the given Japanese theme. Base theme area: {base_keywords}. Return only keywords separated by space. Focus on positive, inspiring imagery."
-                    },
-                    {
-                        "role": "user",
-                        "content": theme
-                    }
-                ],
-                max_tokens=50,
-                temperature=0.7
-            )
+            with self.shared.openai_limiter:
+                response = self.client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": f"Generate 2-3 English keywords for stock photo search based on the given Japanese theme. Base theme area: {base_keywords}. Return only keywords separated by space. Focus on positive, inspiring imagery."
+                        },
+                        {
+                            "role": "user",
+                            "content": theme
+                        }
+                    ],
+                    max_tokens=50,
+                    temperature=0.7
+                )
             return response.choices[0].message.content.strip()
         except:
             return base_keywords
     
+    def _length_targets(self, category_key: str, part: str) -> tuple:
+        """セクションごとの文字数目標と合計（実績に応じて補正）"""
+        base = LENGTH_TARGETS[part]
+        scale = self.generation_stats.target_scale(category_key, part)
+        sections = scale_targets(base["sections"], scale)
+        total = scale_targets((base["total"],), scale)[0]
+        return sections, total
+    
+    def _complete(self, category_key: str, part: str, messages: list, requested_chars: int) -> str:
+        """統計に基づく max_tokens で呼び出し、結果を記録して本文を返す"""
+        stats = self.generation_stats
+        prompt_chars = sum(len(m["content"]) for m in messages)
+        self.token_counter.chars_per_token = stats.input_chars_per_token()
+        estimated_input = self.token_counter.count(messages)
+        max_tokens = min(
+            stats.max_tokens(category_key, part, requested_chars),
+            CONTEXT_WINDOW - estimated_input,
+        )
+        logger.debug(
+            f"{part}: 入力 約{estimated_input}トークン / max_tokens {max_tokens} / 目標 {requested_chars}字"
+        )
+        
+        start = time.perf_counter()
+        with self.shared.openai_limiter:
+            response = self.client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.8
+            )
+        duration = time.perf_counter() - start
+        
+        choice = response.choices[0]
+        content = choice.message.content or ""
+        usage = response.usage
+        stats.record(
+            category_key, part,
+            requested_chars=requested_chars,
+            output_chars=len(content),
+            completion_tokens=usage.completion_tokens if usage else None,
+            prompt_chars=prompt_chars,
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            estimated_prompt_tokens=estimated_input,
+            max_tokens=max_tokens,
+            finish_reason=choice.finish_reason,
+            duration=round(duration, 2),
+        )
+        try:
+            stats.save()
+        except OSError as e:
+            logger.warning(f"⚠️ 生成統計の保存エラー: {e}")
+        
+        if choice.finish_reason == "length":
+            logger.warning(f"⚠️ {part}が上限（{max_tokens}トークン）で打ち切られました")
+        return content
+    
     def _generate_part1(self, theme: str, category_key: str, today: datetime) -> tuple:
         """記事の前半部分を生成（タイトル〜解決策2）"""
-        category = CATEGORIES[category_key]
+        category = self.site.categories[category_key]
         system_prompt = category["system_prompt"]
+        (intro, background, solution1, solution2), total = self._length_targets(category_key, "part1")
         
         user_prompt = f"""以下のテーマで記事の【前半部分】を書いてください。
 
@@ -448,34 +386,31 @@ class ArticleGenerator:
 【書く内容】
 1. 【タイトル】魅力的なタイトルを付ける
 2. ## はじめに
-   - 読者の悩みに深く共感する導入（600文字以上書く）
+   - 読者の悩みに深く共感する導入（{intro}文字以上書く）
    - 「こんな経験はありませんか？」という問いかけ
    - この記事を読むメリット
 3. ## なぜこの問題が起こるのか
-   - 科学的な背景の解説（700文字以上書く）
+   - 科学的な背景の解説（{background}文字以上書く）
    - 具体的な失敗例や研究データ
 4. ## 解決策1：具体的な方法名を入れる
-   - 具体的な方法の説明（800文字以上書く）
+   - 具体的な方法の説明（{solution1}文字以上書く）
    - 実践例や会話例
 5. ## 解決策2：具体的な方法名を入れる
-   - 具体的な方法の説明（800文字以上書く）
+   - 具体的な方法の説明（{solution2}文字以上書く）
    - 実践例や研究データ
 
 【重要】見出しには文字数を書かないでください。見出しは内容を表すものにしてください。
-各セクションを詳しく書いて、合計3000文字以上になるようにしてください。"""
+各セクションを詳しく書いて、合計{total}文字以上になるようにしてください。"""
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        content = self._complete(
+            category_key, "part1",
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            max_tokens=5000,
-            temperature=0.8
+            total,
         )
         
-        content = response.choices[0].message.content
-        
         # タイトルを抽出
         lines = content.split('\n')
         title = ""
@@ -498,11 +433,9 @@ class ArticleGenerator:
     
     def _generate_part2(self, theme: str, title: str, part1_summary: str, category_key: str) -> str:
         """記事の後半部分を生成（解決策3〜まとめ）"""
-        category = CATEGORIES[category_key]
-        system_prompt = category["system_prompt"].replace(
-            "見出しはMarkdown形式",
-            "記事の後半部分を書いてください。前半部分との一貫性を保ってください。\n\n見出しはMarkdown形式"
-        )
+        category = self.site.categories[category_key]
+        system_prompt = category["system_prompt_part2"]
+        (solution3, solution4, tips, summary), total = self._length_targets(category_key, "part2")
         
         user_prompt = f"""記事の【後半部分】を書いてください。
 
@@ -514,33 +447,30 @@ class ArticleGenerator:
 
 【書く内容】
 1. ## 解決策3：具体的な方法名を入れる
-   - 具体的な方法の説明（800文字以上書く）
+   - 具体的な方法の説明（{solution3}文字以上書く）
    - 実践例や研究データ
 2. ## 解決策4：具体的な方法名を入れる
-   - 具体的な方法の説明（600文字以上書く）
+   - 具体的な方法の説明（{solution4}文字以上書く）
    - 実践のポイント
 3. ## 今日からできる実践のコツ
-   - 日常で使える簡単なテクニック3〜5つ（600文字以上書く）
+   - 日常で使える簡単なテクニック3〜5つ（{tips}文字以上書く）
    - ステップバイステップの説明
 4. ## まとめ
-   - 記事の要点のおさらい（500文字以上書く）
+   - 記事の要点のおさらい（{summary}文字以上書く）
    - 読者への励ましのメッセージ
    - 次のアクションの提案
 
 【重要】見出しには文字数を書かないでください。見出しは内容を表すものにしてください。
-各セクションを詳しく書いて、合計2500文字以上になるようにしてください。"""
+各セクションを詳しく書いて、合計{total}文字以上になるようにしてください。"""
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
+        return self._complete(
+            category_key, "part2",
+            [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            max_tokens=5000,
-            temperature=0.8
-        )
-        
-        return response.choices[0].message.content.strip()
+            total,
+        ).strip()
     
     def generate_article(self) -> dict:
         """記事を生成（2パート方式で5000-6000文字を確保）"""
@@ -549,48 +479,60 @@ class ArticleGenerator:
         
         # 今日のカテゴリを決定
         today = datetime.now()
-        category_key = get_category_for_date(today)
-        category = CATEGORIES[category_key]
+        category_key = self.site.category_for_date(today)
+        category = self.site.categories[category_key]
         
-        print(f"📂 今日のカテゴリ: {category['name']}")
+        logger.info(f"📂 [{self.site.name}] 今日のカテゴリ: {category['name']}")
         
         for attempt in range(max_retries):
-            print(f"\n📝 記事生成 試行 {attempt + 1}/{max_retries}")
+            self.attempts = attempt + 1
+            logger.info(f"\n📝 記事生成 試行 {attempt + 1}/{max_retries}")
             
             # ユニークなテーマを選択
-            theme = self.generate_unique_theme(category_key, history)
+            theme = self.generate_unique_theme(category_key, history, attempt)
             date_str = today.strftime("%Y-%m-%d")
+            stage_fields = {
+                "site": self.site.name, "slug": date_str,
+                "category": category_key, "attempt": attempt + 1,
+            }
             
-            print(f"🎯 テーマ: {theme}")
+            logger.info(f"🎯 テーマ: {theme}")
             
             try:
                 # パート1を生成
-                print("📄 パート1（前半）を生成中...")
-                title, part1 = self._generate_part1(theme, category_key, today)
-                print(f"   パート1: {len(part1)}文字")
+                logger.info("📄 パート1（前半）を生成中...")
+                with log_stage(logger, "part1", self.timings, **stage_fields):
+                    title, part1 = self._generate_part1(theme, category_key, today)
+                logger.info(f"   パート1: {len(part1)}文字")
                 
                 # パート2を生成
-                print("📄 パート2（後半）を生成中...")
-                part2 = self._generate_part2(theme, title, part1, category_key)
-                print(f"   パート2: {len(part2)}文字")
+                logger.info("📄 パート2（後半）を生成中...")
+                with log_stage(logger, "part2", self.timings, **stage_fields):
+                    part2 = self._generate_part2(theme, title, part1, category_key)
+                logger.info(f"   パート2: {len(part2)}文字")
                 
                 # 結合
                 content = part1 + "\n\n" + part2
                 char_count = len(content)
-                print(f"📊 合計文字数: {char_count}文字")
+                logger.info(f"📊 合計文字数: {char_count}文字")
                 
                 # 文字数チェック（3000文字以上で許容）
                 if char_count < 3000:
-                    print(f"⚠️ 文字数不足 ({char_count}字)、再生成します...")
+                    logger.warning(f"⚠️ 文字数不足 ({char_count}字)、再生成します...")
                     continue
                 
                 # 重複チェック
-                if self.is_duplicate(title, content, history):
-                    print(f"⚠️ 重複検出、再生成します...")
+                with log_stage(logger, "duplicate_check", self.timings, **stage_fields):
+                    duplicate = self.is_duplicate(title, content, history)
+                if duplicate:
+                    logger.warning(f"⚠️ 重複検出、再生成します...")
                     continue
                 
                 # 画像を取得
-                image_path, photo_credit = self.generate_image_from_unsplash(theme, category_key)
+                with log_stage(logger, "image", self.timings, **stage_fields):
+                    image_path, photo_credit = self.generate_image_from_unsplash(
+                        theme, category_key, date_str
+                    )
                 
                 # スラッグを生成
                 slug = date_str
@@ -605,9 +547,11 @@ class ArticleGenerator:
                     "hash": hashlib.md5(content.encode()).hexdigest()
                 })
                 self.save_post_history(history)
+                self.theme_scheduler.record(category_key, theme)
+                self.theme_scheduler.save()
                 
-                print(f"✅ 記事生成成功！")
-                print(f"📌 タイトル: {title}")
+                logger.info(f"✅ 記事生成成功！")
+                logger.info(f"📌 タイトル: {title}")
                 
                 return {
                     "title": title,
@@ -619,23 +563,21 @@ class ArticleGenerator:
                     "slug": slug,
                     "image": image_path,
                     "photo_credit": photo_credit,
-                    "char_count": char_count
+                    "char_count": char_count,
+                    "attempts": attempt + 1
                 }
                 
             except Exception as e:
-                print(f"⚠️ 生成エラー: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"⚠️ 生成エラー: {e}")
                 continue
         
         raise Exception("記事生成に失敗しました（最大試行回数超過）")
     
     def save_article(self, article: dict):
         """記事をMarkdownファイルとして保存"""
-        POSTS_DIR.mkdir(parents=True, exist_ok=True)
-        
-        filename = f"{article['slug']}.md"
-        filepath = POSTS_DIR / filename
+        # 年/月ディレクトリに保存（content/posts/2026/01/2026-01-01.md）
+        filepath = post_path(article['slug'], article['date'], self.site.posts_dir)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
         
         # フロントマター
         frontmatter = f"""---
@@ -657,24 +599,35 @@ charCount: {article['char_count']}
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(full_content)
         
-        print(f"💾 記事を保存しました: {filepath}")
+        logger.info(f"💾 記事を保存しました: {filepath}")
+        record_post(filepath, self.site.posts_dir, raw=full_content)
+        
+        # レンダリングキャッシュを更新（失敗しても記事保存は成功扱い）
+        try:
+            update_render_cache(filepath, cache_dir=self.site.render_cache_dir)
+            logger.info(f"🧱 レンダリングキャッシュを更新しました")
+        except Exception as e:
+            logger.warning(f"⚠️ レンダリングキャッシュ更新エラー: {e}")
+        
         return filepath
 
 
-def send_to_obsidian(article: dict):
+def send_to_obsidian(article: dict, site: SiteConfig = DEFAULT_SITE):
     """記事をObsidian Vaultに保存"""
+    if site.obsidian_vault_path is None:
+        return False
     try:
         # Obsidian Vaultディレクトリを確認・作成
-        OBSIDIAN_VAULT_PATH.mkdir(parents=True, exist_ok=True)
+        site.obsidian_vault_path.mkdir(parents=True, exist_ok=True)
         
         # ファイル名を生成（日付_タイトル形式）
         # ファイル名に使えない文字を除去
         safe_title = article['title'].replace('/', '').replace('\\', '').replace(':', '').replace('*', '').replace('?', '').replace('"', '').replace('<', '').replace('>', '').replace('|', '')
         filename = f"{article['date']}_{safe_title[:50]}.md"
-        filepath = OBSIDIAN_VAULT_PATH / filename
+        filepath = site.obsidian_vault_path / filename
         
         # カテゴリに応じたタグを設定
-        category_tag = CATEGORIES[article['category']]["tag"]
+        category_tag = site.categories[article['category']]["tag"]
         
         # Obsidian用のフロントマター
         frontmatter = f"""---
@@ -687,7 +640,7 @@ tags:
   - ブログ
   - {category_tag}
   - 自動生成
-blogUrl: "{BLOG_URL}/blog/{article['slug']}"
+blogUrl: "{site.blog_url}/blog/{article['slug']}"
 ---
 
 """
@@ -699,54 +652,131 @@ blogUrl: "{BLOG_URL}/blog/{article['slug']}"
         with open(filepath, 'w', encoding='utf-8') as f:
             f.write(full_content)
         
-        print(f"✅ Obsidianに保存しました: {filepath}")
-        print(f"📌 タイトル: {article['title']}")
-        print(f"📂 カテゴリ: {article['category_name']}")
-        print(f"📊 文字数: {article['char_count']:,}字")
-        print(f"🔗 ブログURL: {BLOG_URL}/blog/{article['slug']}")
+        logger.info(f"✅ Obsidianに保存しました: {filepath}")
+        logger.info(f"📌 タイトル: {article['title']}")
+        logger.info(f"📂 カテゴリ: {article['category_name']}")
+        logger.info(f"📊 文字数: {article['char_count']:,}字")
+        logger.info(f"🔗 ブログURL: {site.blog_url}/blog/{article['slug']}")
         return True
         
     except Exception as e:
-        print(f"⚠️ Obsidian保存エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"⚠️ Obsidian保存エラー: {e}")
         return False
 
 
-def main():
-    """メイン処理"""
-    print("=" * 50)
-    print("🌟 ブログ記事自動生成（3カテゴリ対応）")
-    print("=" * 50)
-    
-    # 今日のカテゴリを表示
+def _notify(notifier: DiscordNotifier, build_embed):
+    """通知をキューに積む（通知の組み立て・送信の失敗で生成を失敗させない）"""
+    if notifier is None or not notifier.enabled:
+        return
+    try:
+        notifier.notify(build_embed())
+    except Exception as e:
+        logger.warning(f"⚠️ 通知エラー: {e}")
+
+
+def run_site(site: SiteConfig, shared: SharedClients, notifier: DiscordNotifier = None) -> dict:
+    """1サイト分の記事を生成・保存し、Obsidianに送って結果を通知"""
     today = datetime.now()
-    category_key = get_category_for_date(today)
-    category = CATEGORIES[category_key]
-    print(f"📅 日付: {today.strftime('%Y-%m-%d')}")
-    print(f"📂 カテゴリ: {category['name']}")
-    print("=" * 50)
+    category = site.categories[site.category_for_date(today)]
+    logger.info(f"🌐 [{site.name}] {site.display_name} / 📂 {category['name']}")
     
-    generator = ArticleGenerator()
+    generator = ArticleGenerator(site, shared)
+    try:
+        article = _generate_and_publish(site, generator)
+    except Exception as e:
+        _notify(notifier, lambda: failure_embed(site.name, e, generator.timings, generator.attempts))
+        raise
     
+    _notify(notifier, lambda: success_embed(
+        site.name, article, generator.timings, f"{site.blog_url}/posts/{article['slug']}"
+    ))
+    return article
+
+
+def _generate_and_publish(site: SiteConfig, generator: ArticleGenerator) -> dict:
     # 記事を生成
     article = generator.generate_article()
+    stage_fields = {"site": site.name, "slug": article['slug'], "category": article['category']}
     
     # 記事を保存
-    filepath = generator.save_article(article)
+    with log_stage(logger, "save", generator.timings, **stage_fields):
+        filepath = generator.save_article(article)
     
     # Obsidianに保存
-    send_to_obsidian(article)
-    
-    print("\n" + "=" * 50)
-    print("✨ 完了！")
-    print(f"📄 ファイル: {filepath}")
-    print(f"📂 カテゴリ: {article['category_name']}")
-    print(f"📊 文字数: {article['char_count']}字")
-    print("=" * 50)
+    with log_stage(logger, "obsidian", generator.timings, **stage_fields):
+        send_to_obsidian(article, site)
     
+    article["filepath"] = filepath
     return article
 
 
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="ブログ記事を自動生成")
+    parser.add_argument(
+        "--site", type=Path, action="append",
+        help="サイト設定ファイル（複数指定可、既定: scripts/sites/ennek.json）",
+    )
+    parser.add_argument("--all-sites", action="store_true", help="scripts/sites の全サイトを生成")
+    parser.add_argument("--workers", type=int, help="同時に生成するサイト数（既定: サイト数）")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    
+    setup_logging("generate")
+    profile_dir = enable_profiling_from_args(args.profile, LOG_DIR, "generate")
+    if profile_dir:
+        logger.info(f"🔬 プロファイル出力先: {profile_dir}")
+    
+    # 並列に書き込む前に、サイト間で出力先が重ならないことを確認
+    try:
+        if args.all_sites:
+            sites = load_all_sites()
+        elif args.site:
+            sites = check_sites([load_site(path) for path in args.site])
+        else:
+            sites = [DEFAULT_SITE]
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    
+    # プロファイラは同時に1ステージしか計測できないため、指定時は順番に実行
+    workers = 1 if profile_dir else (args.workers or len(sites))
+    
+    logger.info("=" * 50)
+    logger.info("🌟 ブログ記事自動生成")
+    logger.info("=" * 50)
+    logger.info(f"📅 日付: {datetime.now().strftime('%Y-%m-%d')}")
+    logger.info(f"🌐 サイト: {', '.join(site.name for site in sites)}")
+    logger.info("=" * 50)
+    
+    shared = SharedClients(pool_size=max(8, len(sites) * 2))
+    notifier = DiscordNotifier.from_env().start()
+    results, failures = {}, {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {site.name: pool.submit(run_site, site, shared, notifier) for site in sites}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.exception(f"❌ [{name}] 記事生成に失敗しました: {e}")
+                    failures[name] = e
+    finally:
+        shared.close()
+        # 生成はすべて終わっているので、残りの通知を送り切る（上限あり）
+        notifier.close()
+    
+    logger.info("\n" + "=" * 50)
+    logger.info("✨ 完了！")
+    for name, article in results.items():
+        logger.info(f"📄 [{name}] {article['filepath']}")
+        logger.info(f"   📂 カテゴリ: {article['category_name']} / 📊 文字数: {article['char_count']}字")
+    logger.info("=" * 50)
+    
+    if failures:
+        sys.exit(1)
+    return results
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+生成統計とトークン予算
+- カテゴリ × パートごとに、出力文字数・トークン数・打ち切り（finish_reason=length）を記録
+- 直近の記録から各呼び出しの max_tokens と、プロンプトで指示する文字数を決める
+    max_tokens: 出力トークンのp95（と目標文字数 ÷ 文字/トークン比）に余裕を持たせた値
+                打ち切りが出た場合は、そのときの上限より大きくする
+    文字数目標: 指示した文字数に対する実際の出力の比率で補正（届かなければ増やす）
+- 送信前に入力トークン数を見積もる（tiktokenがあれば使い、なければ実績の文字/トークン比）
+
+使い方:
+    python scripts/generation_stats.py    # カテゴリ × パートごとの統計と現在の予算を表示
+"""
+
+import sys
+import json
+import math
+import statistics
+import argparse
+from pathlib import Path
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# パス設定
+PROJECT_ROOT = Path(__file__).parent.parent
+STATS_FILE = PROJECT_ROOT / "scripts" / "generation_stats.json"
+
+# 保持する記録数と、統計を使い始める記録数（カテゴリ × パートごと）
+MAX_SAMPLES = 60
+MIN_SAMPLES = 5
+
+# max_tokens の既定値と範囲
+DEFAULT_MAX_TOKENS = 5000
+MIN_MAX_TOKENS = 1500
+MAX_MAX_TOKENS = 8000
+TOKEN_HEADROOM = 1.25
+TRUNCATION_STEP = 1.5
+
+# 文字数目標の補正範囲（1.0 = プロンプトの既定値どおり）
+MIN_TARGET_SCALE = 0.8
+MAX_TARGET_SCALE = 1.5
+
+# 入力トークン見積もり（tiktokenがない場合の既定の文字/トークン比、日本語はほぼ1文字1トークン）
+DEFAULT_CHARS_PER_TOKEN = 1.0
+MESSAGE_OVERHEAD_TOKENS = 4
+CONTEXT_WINDOW = 128000
+FALLBACK_ENCODING = "o200k_base"
+
+
+def percentile(values: list, q: float) -> float:
+    """最近傍順位法によるパーセンタイル"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class TokenCounter:
+    """送信前の入力トークン見積もり"""
+
+    def __init__(self, model: str, chars_per_token: float = DEFAULT_CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding(FALLBACK_ENCODING)
+
+    @property
+    def exact(self) -> bool:
+        return self.encoding is not None
+
+    def count(self, messages: list) -> int:
+        total = 3
+        for message in messages:
+            content = message["content"]
+            if self.encoding is not None:
+                total += len(self.encoding.encode(content))
+            else:
+                total += math.ceil(len(content) / self.chars_per_token)
+            total += MESSAGE_OVERHEAD_TOKENS
+        return total
+
+
+class GenerationStats:
+    """カテゴリ × パートごとの生成記録と、そこから求める予算"""
+
+    def __init__(self, data: dict = None, stats_file: Path = STATS_FILE):
+        # "カテゴリ/パート" → 記録のリスト（古い順）
+        self.data = data or {}
+        self.stats_file = Path(stats_file)
+
+    @classmethod
+    def load(cls, stats_file: Path = STATS_FILE) -> "GenerationStats":
+        stats_file = Path(stats_file)
+        if stats_file.exists():
+            try:
+                with open(stats_file, 'r', encoding='utf-8') as f:
+                    return cls(json.load(f), stats_file)
+            except (OSError, ValueError):
+                pass
+        return cls(stats_file=stats_file)
+
+    def save(self):
+        self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.stats_file, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+    def samples(self, category_key: str, part: str) -> list:
+        return self.data.get(f"{category_key}/{part}", [])
+
+    def record(self, category_key: str, part: str, **sample):
+        """1回分の記録を追加（requested_chars, output_chars, completion_tokens,
+        prompt_chars, prompt_tokens, max_tokens, finish_reason, duration）"""
+        key = f"{category_key}/{part}"
+        self.data[key] = (self.data.get(key, []) + [sample])[-MAX_SAMPLES:]
+
+    def chars_per_token(self, category_key: str, part: str) -> float:
+        """出力の文字/トークン比（記録が少なければNone）"""
+        ratios = [
+            s["output_chars"] / s["completion_tokens"]
+            for s in self.samples(category_key, part) if s.get("completion_tokens")
+        ]
+        return statistics.median(ratios) if len(ratios) >= MIN_SAMPLES else None
+
+    def input_chars_per_token(self) -> float:
+        """入力の文字/トークン比（全カテゴリの実績、tiktokenがない場合の見積もり用）"""
+        ratios = [
+            s["prompt_chars"] / s["prompt_tokens"]
+            for samples in self.data.values() for s in samples if s.get("prompt_tokens")
+        ]
+        return statistics.median(ratios) if len(ratios) >= MIN_SAMPLES else DEFAULT_CHARS_PER_TOKEN
+
+    def target_scale(self, category_key: str, part: str) -> float:
+        """指示する文字数の補正係数（実際の出力 ÷ 指示した文字数 の中央値の逆数）"""
+        yields = [
+            s["output_chars"] / s["requested_chars"]
+            for s in self.samples(category_key, part)
+            if s.get("requested_chars") and s.get("finish_reason") == "stop"
+        ]
+        if len(yields) < MIN_SAMPLES:
+            return 1.0
+        scale = 1 / statistics.median(yields)
+        return min(MAX_TARGET_SCALE, max(MIN_TARGET_SCALE, scale))
+
+    def max_tokens(self, category_key: str, part: str, requested_chars: int) -> int:
+        """この呼び出しの max_tokens"""
+        samples = self.samples(category_key, part)
+        completed = [s["completion_tokens"] for s in samples if s.get("finish_reason") == "stop"]
+        if len(completed) < MIN_SAMPLES:
+            return DEFAULT_MAX_TOKENS
+
+        cap = percentile(completed, 95) * TOKEN_HEADROOM
+        chars_per_token = self.chars_per_token(category_key, part)
+        if chars_per_token:
+            cap = max(cap, requested_chars / chars_per_token * TOKEN_HEADROOM)
+
+        # 直近で打ち切られていたら、そのときの上限より広げる
+        for sample in samples[-MIN_SAMPLES:]:
+            if sample.get("finish_reason") == "length":
+                cap = max(cap, sample.get("max_tokens", DEFAULT_MAX_TOKENS) * TRUNCATION_STEP)
+
+        cap = math.ceil(cap / 100) * 100
+        return int(min(MAX_MAX_TOKENS, max(MIN_MAX_TOKENS, cap)))
+
+    def summary(self) -> list:
+        """(キー, 件数, 文字/トークン, p50, p95, 打ち切り率) の一覧"""
+        rows = []
+        for key in sorted(self.data):
+            samples = self.data[key]
+            tokens = [s["completion_tokens"] for s in samples if s.get("completion_tokens")]
+            category_key, part = key.split("/", 1)
+            truncated = sum(1 for s in samples if s.get("finish_reason") == "length")
+            rows.append({
+                "key": key,
+                "count": len(samples),
+                "chars_per_token": self.chars_per_token(category_key, part),
+                "p50": percentile(tokens, 50) if tokens else None,
+                "p95": percentile(tokens, 95) if tokens else None,
+                "truncated": truncated / len(samples) if samples else 0.0,
+                "scale": self.target_scale(category_key, part),
+            })
+        return rows
+
+
+def scale_targets(targets: tuple, scale: float) -> tuple:
+    """文字数目標を補正（50字単位に丸める）"""
+    return tuple(int(round(target * scale / 50) * 50) for target in targets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成統計とトークン予算を表示")
+    parser.add_argument("--site", type=Path, help="サイト設定ファイル（既定: scripts/sites/ennek.json）")
+    args = parser.parse_args()
+
+    from site_config import DEFAULT_SITE, load_site
+
+    site = load_site(args.site) if args.site else DEFAULT_SITE
+    stats = GenerationStats.load(site.generation_stats_file)
+
+    print("=" * 50)
+    print(f"📈 生成統計（{site.display_name}）")
+    print("=" * 50)
+    if not stats.data:
+        print("   記録がありません")
+    for row in stats.summary():
+        cpt = f"{row['chars_per_token']:.2f}" if row["chars_per_token"] else "-"
+        print(
+            f"{row['key']}: {row['count']}件 文字/トークン {cpt} "
+            f"p50 {row['p50']} p95 {row['p95']} 打ち切り {row['truncated']:.0%} "
+            f"目標補正 x{row['scale']:.2f}"
+        )
+    print(f"   入力の見積もり: {'tiktoken' if tiktoken else f'{stats.input_chars_per_token():.2f} 文字/トークン'}")
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+画像インデックス（知覚ハッシュによる重複検出）
+- public/images の各画像について aHash / dHash（64bit）を計算して保存
+- BKツリーでハミング距離の近い画像を高速に検索
+- Unsplashの写真IDも記録し、同じ写真の再ダウンロードを防止
+- 既存の重複画像を1ファイルにまとめる一括コマンド
+
+使い方:
+    python scripts/image_index.py                 # インデックスを更新
+    python scripts/image_index.py --dedupe        # 重複画像を統合
+    python scripts/image_index.py --dedupe --dry-run
+    python scripts/image_index.py --site scripts/sites/other.json  # 別サイトの画像
+"""
+
+import io
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from post_store import iter_post_files, load_manifest, manifest_entry, save_manifest
+from image_store import ASSET_DIR, load_manifest as load_image_manifest, record_image
+from site_config import DEFAULT_SITE, SiteConfig, load_site
+
+# パス設定（scripts/sites/ennek.json）
+PROJECT_ROOT = Path(__file__).parent.parent
+POSTS_DIR = DEFAULT_SITE.posts_dir
+IMAGES_DIR = DEFAULT_SITE.images_dir
+IMAGE_INDEX_FILE = DEFAULT_SITE.image_index_file
+
+# この距離以下なら同じ写真とみなす（64bit中）
+DHASH_THRESHOLD = 6
+AHASH_THRESHOLD = 10
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+# =============================================================================
+# 知覚ハッシュ
+# =============================================================================
+
+def hashing_available() -> bool:
+    """Pillowが使えるか"""
+    return Image is not None
+
+
+def _grayscale(image, size: tuple):
+    return image.convert("L").resize(size, Image.LANCZOS)
+
+
+def average_hash(image) -> int:
+    """aHash: 8x8に縮小し、平均より明るい画素を1とする"""
+    pixels = list(_grayscale(image, (8, 8)).tobytes())
+    mean = sum(pixels) / len(pixels)
+    value = 0
+    for pixel in pixels:
+        value = (value << 1) | (pixel > mean)
+    return value
+
+
+def difference_hash(image) -> int:
+    """dHash: 9x8に縮小し、右隣より明るい画素を1とする"""
+    pixels = list(_grayscale(image, (9, 8)).tobytes())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def compute_hashes(data: bytes) -> dict:
+    """画像バイト列から {ahash, dhash} を計算"""
+    with Image.open(io.BytesIO(data)) as image:
+        image.draft("L", (64, 64))  # JPEGは縮小デコードで高速化
+        return {"ahash": average_hash(image), "dhash": difference_hash(image)}
+
+
+def hamming(a: int, b: int) -> int:
+    """ハミング距離"""
+    return bin(a ^ b).count("1")
+
+
+# =============================================================================
+# BKツリー
+# =============================================================================
+
+class BKTree:
+    """ハミング距離によるBKツリー（閾値以内の近傍検索用）"""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value: int, key: str):
+        node = self.root
+        if node is None:
+            self.root = (value, key, {})
+            return
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (value, key, {})
+                return
+            node = child
+
+    def search(self, value: int, threshold: int) -> list:
+        """閾値以内の (距離, キー) を距離の近い順に返す"""
+        if self.root is None:
+            return []
+        results = []
+        stack = [self.root]
+        while stack:
+            node_value, key, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= threshold:
+                results.append((distance, key))
+            # 三角不等式により [d - t, d + t] の子だけを探索
+            for child_distance, child in children.items():
+                if distance - threshold <= child_distance <= distance + threshold:
+                    stack.append(child)
+        return sorted(results)
+
+
+# =============================================================================
+# インデックス
+# =============================================================================
+
+class ImageIndex:
+    """public/images の知覚ハッシュと写真IDのインデックス"""
+
+    def __init__(self, entries: dict = None, index_file: Path = IMAGE_INDEX_FILE):
+        # ファイル名 → {"ahash", "dhash", "photo_id", "sha256"}
+        self.entries = entries or {}
+        self.index_file = Path(index_file)
+        self._tree = None
+
+    @classmethod
+    def load(cls, index_file: Path = IMAGE_INDEX_FILE) -> "ImageIndex":
+        """インデックスを読み込む"""
+        index_file = Path(index_file)
+        if index_file.exists():
+            try:
+                with open(index_file, 'r', encoding='utf-8') as f:
+                    return cls(json.load(f), index_file)
+            except (OSError, ValueError):
+                return cls(index_file=index_file)
+        return cls(index_file=index_file)
+
+    def save(self):
+        """インデックスを保存（ハッシュは16進文字列で保存）"""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.index_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    @property
+    def tree(self) -> BKTree:
+        if self._tree is None:
+            self._tree = BKTree()
+            for filename, entry in self.entries.items():
+                if entry.get("dhash"):
+                    self._tree.add(int(entry["dhash"], 16), filename)
+        return self._tree
+
+    def has_photo(self, photo_id: str) -> bool:
+        """同じUnsplash写真IDが登録済みか"""
+        return bool(photo_id) and any(
+            entry.get("photo_id") == photo_id for entry in self.entries.values()
+        )
+
+    def find_similar(self, hashes: dict) -> str:
+        """見た目がほぼ同じ画像のファイル名を返す（なければNone）"""
+        for _, filename in self.tree.search(hashes["dhash"], DHASH_THRESHOLD):
+            entry = self.entries.get(filename, {})
+            if entry.get("ahash") and hamming(int(entry["ahash"], 16), hashes["ahash"]) <= AHASH_THRESHOLD:
+                return filename
+        return None
+
+    def add(self, filename: str, hashes: dict = None, photo_id: str = None, sha256: str = None):
+        """画像を登録"""
+        entry = {"photo_id": photo_id, "sha256": sha256}
+        if hashes:
+            entry["ahash"] = f"{hashes['ahash']:016x}"
+            entry["dhash"] = f"{hashes['dhash']:016x}"
+        self.entries[filename] = entry
+        if hashes and self._tree is not None:
+            self._tree.add(hashes["dhash"], filename)
+
+    def remove(self, filename: str):
+        self.entries.pop(filename, None)
+        self._tree = None
+
+    def rename(self, renamed: dict):
+        """ファイル名の変更を反映（移動先が登録済みならそちらを残す）"""
+        for old, new in renamed.items():
+            entry = self.entries.pop(old, None)
+            if entry and new not in self.entries:
+                self.entries[new] = entry
+        self._tree = None
+
+    def refresh(self, images_dir: Path = IMAGES_DIR) -> dict:
+        """public/images（と assets/）を走査し、新規・変更された画像だけハッシュを計算"""
+        images_dir = Path(images_dir)
+        counts = {"hashed": 0, "skipped": 0, "removed": 0}
+        present = set()
+
+        paths = list(images_dir.iterdir())
+        if (images_dir / ASSET_DIR).is_dir():
+            paths.extend((images_dir / ASSET_DIR).iterdir())
+        for path in sorted(paths):
+            if path.suffix.lower() not in IMAGE_EXTENSIONS:
+                continue
+            filename = path.relative_to(images_dir).as_posix()
+            present.add(filename)
+            data = path.read_bytes()
+            sha256 = hashlib.sha256(data).hexdigest()
+            entry = self.entries.get(filename, {})
+            if entry.get("dhash") and entry.get("sha256") == sha256:
+                counts["skipped"] += 1
+                continue
+            try:
+                self.add(filename, compute_hashes(data), entry.get("photo_id"), sha256)
+                counts["hashed"] += 1
+            except Exception as e:
+                print(f"⚠️ エラー ({filename}): {e}")
+
+        for filename in list(self.entries):
+            if filename not in present:
+                self.remove(filename)
+                counts["removed"] += 1
+
+        self._tree = None
+        return counts
+
+
+# =============================================================================
+# 重複統合
+# =============================================================================
+
+def find_duplicates(index: ImageIndex) -> dict:
+    """重複画像 → 残す画像 の対応を返す（ファイル名順で先の画像を残す）"""
+    kept = ImageIndex()
+    kept._tree = BKTree()
+    duplicates = {}
+    for filename in sorted(index.entries):
+        entry = index.entries[filename]
+        if not entry.get("dhash"):
+            continue
+        hashes = {"ahash": int(entry["ahash"], 16), "dhash": int(entry["dhash"], 16)}
+        original = kept.find_similar(hashes)
+        if original:
+            duplicates[filename] = original
+        else:
+            kept.entries[filename] = entry
+            kept._tree.add(hashes["dhash"], filename)
+    return duplicates
+
+
+def rewrite_post_images(duplicates: dict, posts_dir: Path = POSTS_DIR) -> list:
+    """記事フロントマターの image: を統合先の画像に書き換え、更新した記事を返す"""
+    updated = []
+    for post_file in iter_post_files(posts_dir):
+        content = post_file.read_text(encoding='utf-8')
+        new_content = content
+        for duplicate, original in duplicates.items():
+            new_content = re.sub(
+                rf'^image: "/images/{re.escape(duplicate)}"$',
+                f'image: "/images/{original}"',
+                new_content,
+                count=1,
+                flags=re.MULTILINE,
+            )
+        if new_content != content:
+            post_file.write_text(new_content, encoding='utf-8')
+            updated.append(post_file)
+    return updated
+
+
+def dedupe_images(index: ImageIndex, dry_run: bool = False, site: SiteConfig = DEFAULT_SITE) -> dict:
+    """重複画像を統合（記事の参照と画像マニフェストを書き換えてから重複ファイルを削除）"""
+    duplicates = find_duplicates(index)
+    for duplicate, original in duplicates.items():
+        print(f"🔁 {duplicate} → {original}")
+    if dry_run or not duplicates:
+        return duplicates
+
+    from render_cache import update_render_cache
+
+    posts = load_manifest(site.posts_dir)
+    for post_file in rewrite_post_images(duplicates, site.posts_dir):
+        update_render_cache(post_file, cache_dir=site.render_cache_dir)
+        posts[post_file.stem] = manifest_entry(post_file, site.posts_dir)
+        print(f"✏️ 画像参照を更新: {post_file.name}")
+    save_manifest(posts, site.posts_dir)
+
+    # スラッグ → 画像 の記録も残す側の画像に差し替える
+    for slug, entry in sorted(load_image_manifest(site.image_manifest_file).items()):
+        original = duplicates.get(entry["file"])
+        if original:
+            sha256 = index.entries[original].get("sha256") \
+                or hashlib.sha256((site.images_dir / original).read_bytes()).hexdigest()
+            record_image(slug, original, sha256, site.image_manifest_file)
+
+    for duplicate in duplicates:
+        (site.images_dir / duplicate).unlink(missing_ok=True)
+        index.remove(duplicate)
+    index.save()
+    return duplicates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="画像の知覚ハッシュインデックスを更新")
+    parser.add_argument("--dedupe", action="store_true", help="見た目が同じ画像を1ファイルに統合する")
+    parser.add_argument("--dry-run", action="store_true", help="統合対象を表示するだけ")
+    parser.add_argument("--site", type=Path, help="サイト設定ファイル（既定: scripts/sites/ennek.json）")
+    args = parser.parse_args()
+
+    site = load_site(args.site) if args.site else DEFAULT_SITE
+
+    if not hashing_available():
+        print("❌ Pillowがインストールされていません: pip install pillow")
+        return 1
+
+    print("=" * 50)
+    print("🖼️ 画像インデックスを更新")
+    print("=" * 50)
+
+    index = ImageIndex.load(site.image_index_file)
+    counts = index.refresh(site.images_dir)
+    index.save()
+    print(f"   ハッシュ計算: {counts['hashed']}件")
+    print(f"   スキップ: {counts['skipped']}件")
+    print(f"   削除: {counts['removed']}件")
+
+    if args.dedupe:
+        duplicates = dedupe_images(index, dry_run=args.dry_run, site=site)
+        print(f"   重複: {len(duplicates)}件{'（ドライラン）' if args.dry_run else ''}")
+
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+画像の保存（コンテンツアドレス方式）
+- 画像は内容のSHA-256から決まるファイル名で保存: public/images/assets/{hash}.jpg
+- 同じURLの中身が変わることはないため、/images/assets/* は1年間immutableで配信できる
+- 同じ日に再生成しても既存ファイルを上書きしない（別の画像は別のファイル名になる）
+- content/image_manifest.json に 記事スラッグ → 画像 の対応を記録
+- 日付名（2026-01-01.jpg など）の既存画像を移行し、記事の image: を書き換える
+
+使い方:
+    python scripts/image_store.py --migrate --dry-run   # 移行内容の確認
+    python scripts/image_store.py --migrate             # 既存画像と記事を移行
+    python scripts/image_store.py --migrate --site scripts/sites/other.json  # 別サイトを移行
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+
+from sync_to_obsidian import parse_frontmatter
+from post_store import (
+    iter_post_files, manifest_entry,
+    load_manifest as load_post_manifest, save_manifest as save_post_manifest,
+)
+from site_config import DEFAULT_SITE, load_site
+
+# パス設定（scripts/sites/ennek.json）
+PROJECT_ROOT = Path(__file__).parent.parent
+POSTS_DIR = DEFAULT_SITE.posts_dir
+IMAGES_DIR = DEFAULT_SITE.images_dir
+IMAGE_MANIFEST_FILE = DEFAULT_SITE.image_manifest_file
+RENDER_CACHE_DIR = DEFAULT_SITE.render_cache_dir
+IMAGE_MANIFEST_VERSION = 1
+
+# コンテンツアドレスの画像を置くディレクトリ（images_dirからの相対）とURL
+ASSET_DIR = "assets"
+PUBLIC_PREFIX = "/images"
+
+# ファイル名に使うハッシュの桁数（16進）
+HASH_LENGTH = 20
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def asset_name(sha256: str, ext: str = ".jpg") -> str:
+    """画像のファイル名（images_dirからの相対パス）"""
+    return f"{ASSET_DIR}/{sha256[:HASH_LENGTH]}{ext.lower()}"
+
+
+def public_path(name: str) -> str:
+    """フロントマターに書くURL"""
+    return f"{PUBLIC_PREFIX}/{name}"
+
+
+def store_image(data: bytes, images_dir: Path = IMAGES_DIR, ext: str = ".jpg") -> tuple:
+    """画像を保存し、(ファイル名, SHA-256) を返す（同じ内容なら書き込まない）"""
+    sha256 = hashlib.sha256(data).hexdigest()
+    name = asset_name(sha256, ext)
+    path = Path(images_dir) / name
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 書きかけのファイルが公開されないよう、一時ファイルから置き換える
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return name, sha256
+
+
+def load_manifest(manifest_file: Path = IMAGE_MANIFEST_FILE) -> dict:
+    """スラッグ → {"file", "sha256"}"""
+    manifest_file = Path(manifest_file)
+    if manifest_file.exists():
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == IMAGE_MANIFEST_VERSION:
+                return data["posts"]
+        except (OSError, ValueError, KeyError):
+            pass
+    return {}
+
+
+def save_manifest(posts: dict, manifest_file: Path = IMAGE_MANIFEST_FILE):
+    manifest_file = Path(manifest_file)
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({"version": IMAGE_MANIFEST_VERSION, "posts": posts}, f,
+                  ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def record_image(slug: str, name: str, sha256: str, manifest_file: Path = IMAGE_MANIFEST_FILE):
+    """記事の画像を記録（同じ記事を再生成した場合は新しい画像に差し替え）"""
+    posts = load_manifest(manifest_file)
+    posts[slug] = {"file": name, "sha256": sha256}
+    save_manifest(posts, manifest_file)
+
+
+def migrate(posts_dir: Path = POSTS_DIR, images_dir: Path = IMAGES_DIR,
+            manifest_file: Path = IMAGE_MANIFEST_FILE, cache_dir: Path = RENDER_CACHE_DIR,
+            dry_run: bool = False) -> dict:
+    """日付名などの画像をコンテンツアドレスに移し、記事の参照を書き換える"""
+    posts_dir, images_dir = Path(posts_dir), Path(images_dir)
+    counts = {"images": 0, "posts": 0}
+
+    # 1. 画像を移動（同じ内容の画像は1ファイルにまとまる）
+    renamed, hashes = {}, {}
+    for path in sorted(images_dir.iterdir()):
+        if not path.is_file() or path.suffix.lower() not in IMAGE_EXTENSIONS:
+            continue
+        sha256 = hashlib.sha256(path.read_bytes()).hexdigest()
+        name = asset_name(sha256, path.suffix)
+        renamed[path.name] = name
+        hashes[name] = sha256
+        print(f"🖼️ {path.name} → {name}")
+        if not dry_run:
+            target = images_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if target.exists():
+                path.unlink()
+            else:
+                path.rename(target)
+        counts["images"] += 1
+
+    # 2. 記事の参照を書き換え、スラッグ → 画像 を記録
+    from render_cache import update_render_cache
+
+    post_manifest = load_post_manifest(posts_dir)
+    images = load_manifest(manifest_file)
+    for post_file in iter_post_files(posts_dir):
+        content = post_file.read_text(encoding='utf-8')
+        new_content = content
+        for old, new in renamed.items():
+            new_content = new_content.replace(public_path(old), public_path(new))
+
+        if new_content != content:
+            print(f"✏️ 画像参照を更新: {post_file.name}")
+            counts["posts"] += 1
+            if not dry_run:
+                post_file.write_text(new_content, encoding='utf-8')
+                update_render_cache(post_file, cache_dir=cache_dir)
+                post_manifest[post_file.stem] = manifest_entry(post_file, posts_dir, new_content)
+
+        metadata, _ = parse_frontmatter(new_content)
+        image = metadata.get('image', '')
+        name = image[len(PUBLIC_PREFIX) + 1:] if image.startswith(f"{PUBLIC_PREFIX}/{ASSET_DIR}/") else None
+        if name and post_file.stem not in images and name not in hashes and (images_dir / name).exists():
+            hashes[name] = hashlib.sha256((images_dir / name).read_bytes()).hexdigest()
+        if name and name in hashes:
+            images[post_file.stem] = {"file": name, "sha256": hashes[name]}
+
+    if not dry_run:
+        save_post_manifest(post_manifest, posts_dir)
+        save_manifest(images, manifest_file)
+    counts["renamed"] = renamed
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="画像をコンテンツアドレスのファイル名に移行")
+    parser.add_argument("--migrate", action="store_true", help="既存画像を移動し、記事の image: を書き換える")
+    parser.add_argument("--dry-run", action="store_true", help="変更せずに内容だけ表示")
+    parser.add_argument("--site", type=Path, help="サイト設定ファイル（既定: scripts/sites/ennek.json）")
+    args = parser.parse_args()
+
+    if not args.migrate:
+        parser.print_help()
+        return 0
+
+    site = load_site(args.site) if args.site else DEFAULT_SITE
+
+    print("=" * 50)
+    print("🖼️ 画像をコンテンツアドレスに移行")
+    print("=" * 50)
+
+    counts = migrate(site.posts_dir, site.images_dir, site.image_manifest_file,
+                     site.render_cache_dir, dry_run=args.dry_run)
+    if not args.dry_run and counts["renamed"]:
+        from image_index import ImageIndex
+
+        index = ImageIndex.load(site.image_index_file)
+        index.rename(counts["renamed"])
+        index.save()
+
+    print(f"   画像: {counts['images']}件{'（ドライラン）' if args.dry_run else ''}")
+    print(f"   記事: {counts['posts']}件")
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,984 @@
+#!/usr/bin/env python3
+"""
+Markdown → HTML（remark + remark-html と同じ出力）
+- src/lib/posts.ts の remark().use(html) と同じHTMLを出す CommonMark パーサー
+  （緩いリスト・番号の開始値・遅延継続行・見出しの下線記法・強調の左右フランキング規則）
+- 出力形式も mdast-util-to-hast / hast-util-to-html に合わせる
+  （要素間の改行、& と < の文字参照、リンクURLの正規化、安全でないURLの除去）
+- remark と違うのは、見出しにアンカーIDを付けることだけ
+- 生のHTML・参照リンク定義・タブは再現しない（UnsupportedMarkdown を送出し、
+  呼び出し側は remark にフォールバックする）
+"""
+
+import re
+import html
+import unicodedata
+from html.entities import html5
+from urllib.parse import quote
+
+
+class UnsupportedMarkdown(ValueError):
+    """remarkと同じ出力を保証できない記法を含む"""
+
+
+# =============================================================================
+# 文字の分類（micromark と同じ定義）
+# =============================================================================
+
+ASCII_PUNCTUATION = set("!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~")
+
+
+def _is_whitespace(ch: str) -> bool:
+    return ch == "" or ch.isspace()
+
+
+def _is_punctuation(ch: str) -> bool:
+    return ch != "" and (ch in ASCII_PUNCTUATION or unicodedata.category(ch)[0] in "PS")
+
+
+# =============================================================================
+# HTMLの書き出し（hast-util-to-html と同じエスケープ）
+# =============================================================================
+
+def _escape_text(value: str) -> str:
+    return value.replace("&", "&#x26;").replace("<", "&#x3C;")
+
+
+def _escape_attribute(value: str) -> str:
+    for ch, ref in (("&", "&#x26;"), ('"', "&#x22;"), ("'", "&#x27;"), ("`", "&#x60;")):
+        value = value.replace(ch, ref)
+    return value
+
+
+def _attributes(attrs: list) -> str:
+    return "".join(f' {name}="{_escape_attribute(value)}"' for name, value in attrs if value is not None)
+
+
+# リンク先として許可するプロトコル（hast-util-sanitize の既定スキーマ）
+SAFE_PROTOCOLS = {
+    "href": ("http", "https", "irc", "ircs", "mailto", "xmpp"),
+    "src": ("http", "https"),
+}
+
+
+def _safe_url(url: str, kind: str) -> str:
+    """プロトコルが許可されていないURLはNone（属性ごと出力しない）"""
+    colon = url.find(":")
+    if colon == -1:
+        return url
+    for ch in "/?#":
+        index = url.find(ch)
+        if index != -1 and index < colon:
+            return url
+    return url if url[:colon].lower() in SAFE_PROTOCOLS[kind] else None
+
+
+def normalize_uri(url: str) -> str:
+    """micromark-util-sanitize-uri の normalizeUri と同じ正規化"""
+    result = []
+    i = 0
+    while i < len(url):
+        ch = url[i]
+        if ch == "%" and re.match(r"[0-9A-Za-z]{2}", url[i + 1:i + 3]):
+            result.append(url[i:i + 3])
+            i += 3
+            continue
+        result.append(quote(ch, safe="!#$&'()*+,-./:;=?@_~"))
+        i += 1
+    return "".join(result)
+
+
+# =============================================================================
+# ブロック構造
+# =============================================================================
+
+class Block:
+    def __init__(self, kind: str, line: int = 0):
+        self.kind = kind
+        self.parent = None
+        self.children = []
+        self.open = True
+        self.line = line
+        self.end_line = line
+        self.content = ""
+        # 見出し
+        self.level = 0
+        # リスト・リスト項目
+        self.list_data = None
+        self.tight = True
+        # コードブロック
+        self.fenced = False
+        self.fence_char = ""
+        self.fence_length = 0
+        self.fence_offset = 0
+        self.info = ""
+
+    def append(self, child: "Block"):
+        child.parent = self
+        self.children.append(child)
+
+    @property
+    def last_child(self):
+        return self.children[-1] if self.children else None
+
+
+ATX_HEADING_RE = re.compile(r"^#{1,6}(?:[ \t]+|$)")
+FENCE_RE = re.compile(r"^`{3,}(?!.*`)|^~{3,}")
+CLOSING_FENCE_RE = re.compile(r"^(?:`{3,}|~{3,})(?=[ \t]*$)")
+SETEXT_RE = re.compile(r"^(?:=+|-+)[ \t]*$")
+THEMATIC_BREAK_RE = re.compile(r"^(?:\*[ \t]*){3,}$|^(?:_[ \t]*){3,}$|^(?:-[ \t]*){3,}$")
+BULLET_RE = re.compile(r"^[*+-]")
+ORDERED_RE = re.compile(r"^(\d{1,9})([.)])")
+HTML_BLOCK_RE = re.compile(r"^<(?:[A-Za-z][A-Za-z0-9-]*|/[A-Za-z]|!|\?)")
+REFERENCE_DEFINITION_RE = re.compile(r"^\[(?:[^\\\[\]]|\\.)+\]:")
+
+CONTAINERS = ("document", "block_quote", "item")
+
+
+def _can_contain(parent: str, child: str) -> bool:
+    if parent in CONTAINERS:
+        return child != "item"
+    if parent == "list":
+        return child == "item"
+    return False
+
+
+def _separated_by_blank_line(block: Block, following: Block) -> bool:
+    return block.end_line != following.line - 1
+
+
+class BlockParser:
+    """commonmark.js と同じ手順で行ごとにブロック構造を組み立てる"""
+
+    def __init__(self):
+        self.doc = Block("document")
+        self.tip = self.doc
+        self.old_tip = self.doc
+        self.last_matched = self.doc
+        self.all_closed = True
+        self.line_number = 0
+        self.current = ""
+        self.offset = 0
+        self.next_nonspace = 0
+        self.indent = 0
+        self.indented = False
+        self.blank = False
+
+    # ---- 行内の位置 ----------------------------------------------------------
+
+    def _peek(self, pos: int) -> str:
+        return self.current[pos] if pos < len(self.current) else ""
+
+    def _find_next_nonspace(self):
+        i = self.offset
+        while self._peek(i) == " ":
+            i += 1
+        self.next_nonspace = i
+        self.indent = i - self.offset
+        self.indented = self.indent >= 4
+        self.blank = self._peek(i) in ("", "\n")
+
+    def _advance_next_nonspace(self):
+        self.offset = self.next_nonspace
+
+    def _advance_offset(self, count: int):
+        self.offset = min(self.offset + count, len(self.current))
+
+    # ---- ブロックの追加・終了 ------------------------------------------------
+
+    def _add_child(self, kind: str) -> Block:
+        while not _can_contain(self.tip.kind, kind):
+            self._finalize(self.tip)
+        block = Block(kind, self.line_number)
+        self.tip.append(block)
+        self.tip = block
+        return block
+
+    def _close_unmatched(self):
+        if not self.all_closed:
+            while self.old_tip is not self.last_matched:
+                parent = self.old_tip.parent
+                self._finalize(self.old_tip)
+                self.old_tip = parent
+            self.all_closed = True
+
+    def _finalize(self, block: Block, line: int = None):
+        block.open = False
+        block.end_line = self.line_number - 1 if line is None else line
+        if block.kind in ("item", "list"):
+            block.end_line = block.last_child.end_line if block.children else block.line
+        if block.kind == "paragraph":
+            if REFERENCE_DEFINITION_RE.match(block.content.lstrip(" ")):
+                raise UnsupportedMarkdown("参照リンクの定義")
+        elif block.kind == "code_block":
+            if block.fenced:
+                first, _, rest = block.content.partition("\n")
+                block.info = first.strip()
+                block.content = rest
+            else:
+                block.content = re.sub(r"(\n *)+$", "\n", block.content)
+        elif block.kind == "list":
+            # 項目の間、または項目内のブロックの間に空行があれば緩いリスト
+            pairs = list(zip(block.children, block.children[1:]))
+            for item in block.children:
+                pairs += list(zip(item.children, item.children[1:]))
+            block.tight = not any(_separated_by_blank_line(a, b) for a, b in pairs)
+        self.tip = block.parent
+
+    # ---- 継続判定 ------------------------------------------------------------
+
+    def _continue(self, block: Block) -> int:
+        """0: 継続 / 1: 継続しない / 2: この行で完結"""
+        kind = block.kind
+        if kind in ("document", "list"):
+            return 0
+        if kind == "block_quote":
+            if not self.indented and self._peek(self.next_nonspace) == ">":
+                self._advance_next_nonspace()
+                self._advance_offset(1)
+                if self._peek(self.offset) == " ":
+                    self._advance_offset(1)
+                return 0
+            return 1
+        if kind == "item":
+            data = block.list_data
+            if self.blank:
+                if not block.children:
+                    return 1
+                self._advance_next_nonspace()
+            elif self.indent >= data["marker_offset"] + data["padding"]:
+                self._advance_offset(data["marker_offset"] + data["padding"])
+            else:
+                return 1
+            return 0
+        if kind in ("heading", "thematic_break"):
+            return 1
+        if kind == "code_block":
+            if block.fenced:
+                match = (self.indent <= 3 and self._peek(self.next_nonspace) == block.fence_char
+                         and CLOSING_FENCE_RE.match(self.current[self.next_nonspace:]))
+                if match and len(match.group(0)) >= block.fence_length:
+                    self._finalize(block, self.line_number)
+                    return 2
+                skip = block.fence_offset
+                while skip > 0 and self._peek(self.offset) == " ":
+                    self._advance_offset(1)
+                    skip -= 1
+                return 0
+            if self.indent >= 4:
+                self._advance_offset(4)
+            elif self.blank:
+                self._advance_next_nonspace()
+            else:
+                return 1
+            return 0
+        if kind == "paragraph":
+            return 1 if self.blank else 0
+        return 1
+
+    # ---- ブロックの開始 ------------------------------------------------------
+
+    def _parse_list_marker(self, container: Block):
+        rest = self.current[self.next_nonspace:]
+        if self.indent >= 4:
+            return None
+        data = {"marker_offset": self.indent}
+        match = BULLET_RE.match(rest)
+        if match:
+            data.update(ordered=False, bullet=match.group(0), delimiter=None, start=None)
+        else:
+            match = ORDERED_RE.match(rest)
+            if not match or (container.kind == "paragraph" and match.group(1) != "1"):
+                return None
+            data.update(ordered=True, bullet=None, delimiter=match.group(2), start=int(match.group(1)))
+
+        marker_length = len(match.group(0))
+        after = self._peek(self.next_nonspace + marker_length)
+        if after not in ("", " ", "\n"):
+            return None
+        # 空の項目は段落を中断できない
+        if container.kind == "paragraph" and not self.current[self.next_nonspace + marker_length:].strip():
+            return None
+
+        self._advance_next_nonspace()
+        self._advance_offset(marker_length)
+        spaces_start = self.offset
+        while True:
+            self._advance_offset(1)
+            if not (self.offset - spaces_start < 5 and self._peek(self.offset) == " "):
+                break
+        blank_item = self._peek(self.offset) in ("", "\n")
+        spaces_after_marker = self.offset - spaces_start
+        if spaces_after_marker >= 5 or spaces_after_marker < 1 or blank_item:
+            data["padding"] = marker_length + 1
+            self.offset = spaces_start
+            if self._peek(self.offset) == " ":
+                self._advance_offset(1)
+        else:
+            data["padding"] = marker_length + spaces_after_marker
+        return data
+
+    def _try_start(self, container: Block):
+        """ブロックの開始を試す（0: 該当なし / 1: コンテナ開始 / 2: 葉ブロック開始）"""
+        rest = self.current[self.next_nonspace:]
+        first = self._peek(self.next_nonspace)
+
+        if not self.indented and first == ">":
+            self._advance_next_nonspace()
+            self._advance_offset(1)
+            if self._peek(self.offset) == " ":
+                self._advance_offset(1)
+            self._close_unmatched()
+            self._add_child("block_quote")
+            return 1
+
+        if not self.indented and ATX_HEADING_RE.match(rest):
+            match = ATX_HEADING_RE.match(rest)
+            self._advance_next_nonspace()
+            self._advance_offset(len(match.group(0)))
+            self._close_unmatched()
+            heading = self._add_child("heading")
+            heading.level = match.group(0).strip().count("#")
+            text = self.current[self.offset:].rstrip("\n")
+            text = re.sub(r"^[ \t]*#+[ \t]*$", "", text)
+            heading.content = re.sub(r"[ \t]+#+[ \t]*$", "", text)
+            self._advance_offset(len(self.current))
+            return 2
+
+        if not self.indented and FENCE_RE.match(rest):
+            match = FENCE_RE.match(rest)
+            self._close_unmatched()
+            block = self._add_child("code_block")
+            block.fenced = True
+            block.fence_char = match.group(0)[0]
+            block.fence_length = len(match.group(0))
+            block.fence_offset = self.indent
+            self._advance_next_nonspace()
+            self._advance_offset(block.fence_length)
+            return 2
+
+        if not self.indented and first == "<" and HTML_BLOCK_RE.match(rest):
+            raise UnsupportedMarkdown("HTMLブロック")
+
+        if not self.indented and container.kind == "paragraph" and SETEXT_RE.match(rest.rstrip("\n")):
+            self._close_unmatched()
+            heading = Block("heading", container.line)
+            heading.level = 1 if first == "=" else 2
+            heading.content = container.content
+            parent = container.parent
+            parent.children[parent.children.index(container)] = heading
+            heading.parent = parent
+            self.tip = heading
+            self._advance_offset(len(self.current))
+            return 2
+
+        if not self.indented and THEMATIC_BREAK_RE.match(rest.rstrip("\n")):
+            self._close_unmatched()
+            self._add_child("thematic_break")
+            self._advance_offset(len(self.current))
+            return 2
+
+        if not self.indented or container.kind == "list":
+            data = self._parse_list_marker(container)
+            if data:
+                self._close_unmatched()
+                tip = self.tip
+                if tip.kind != "list" or not _lists_match(tip.list_data, data):
+                    block = self._add_child("list")
+                    block.list_data = data
+                item = self._add_child("item")
+                item.list_data = data
+                return 1
+
+        if self.indented and self.tip.kind != "paragraph" and not self.blank:
+            self._advance_offset(4)
+            self._close_unmatched()
+            self._add_child("code_block")
+            return 2
+
+        return 0
+
+    # ---- 1行の処理 -----------------------------------------------------------
+
+    def _add_line(self):
+        self.tip.content += self.current[self.offset:].rstrip("\n") + "\n"
+
+    def incorporate_line(self, line: str):
+        self.line_number += 1
+        self.current = line
+        self.offset = 0
+        container = self.doc
+        self.old_tip = self.tip
+        all_matched = True
+
+        while container.last_child is not None and container.last_child.open:
+            container = container.last_child
+            self._find_next_nonspace()
+            result = self._continue(container)
+            if result == 2:
+                return
+            if result == 1:
+                all_matched = False
+                container = container.parent
+                break
+
+        self.all_closed = container is self.old_tip
+        self.last_matched = container
+
+        matched_leaf = container.kind == "code_block"
+        while not matched_leaf:
+            self._find_next_nonspace()
+            if not self.indented and not re.match(r"[#`~*+_=<>0-9-]", self._peek(self.next_nonspace) or " "):
+                self._advance_next_nonspace()
+                break
+            result = self._try_start(container)
+            if result == 0:
+                self._advance_next_nonspace()
+                break
+            container = self.tip
+            if result == 2:
+                matched_leaf = True
+
+        if not self.all_closed and not self.blank and self.tip.kind == "paragraph":
+            # 遅延継続行（インデントなしでも直前の段落の続き）
+            self._add_line()
+            return
+
+        self._close_unmatched()
+        kind = container.kind
+        if kind in ("code_block", "paragraph"):
+            self._add_line()
+        elif kind in ("heading", "thematic_break"):
+            pass
+        elif self.offset < len(self.current) and not self.blank:
+            self._add_child("paragraph")
+            self._advance_next_nonspace()
+            self._add_line()
+
+    def parse(self, text: str) -> Block:
+        if "\t" in text:
+            raise UnsupportedMarkdown("タブ")
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        for line in lines:
+            self.incorporate_line(line)
+        while self.tip is not None:
+            self._finalize(self.tip, self.line_number)
+        return self.doc
+
+
+def _lists_match(a: dict, b: dict) -> bool:
+    return a["ordered"] == b["ordered"] and a["delimiter"] == b["delimiter"] and a["bullet"] == b["bullet"]
+
+
+# =============================================================================
+# インライン
+# =============================================================================
+
+class Inline:
+    def __init__(self, kind: str, value: str = "", **attrs):
+        self.kind = kind
+        self.value = value
+        self.children = []
+        self.attrs = attrs
+
+
+ENTITY_RE = re.compile(r"&(?:#[xX][0-9a-fA-F]{1,6}|#[0-9]{1,7}|[A-Za-z][A-Za-z0-9]{1,31});")
+AUTOLINK_RE = re.compile(r"^<([A-Za-z][A-Za-z0-9.+-]{1,31}:[^<>\x00-\x20]*)>")
+EMAIL_AUTOLINK_RE = re.compile(
+    r"^<([a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?"
+    r"(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*)>"
+)
+HTML_TAG_RE = re.compile(r"^<(?:/?[A-Za-z][A-Za-z0-9-]*[\s/>]|!--|\?|![A-Za-z]|!\[CDATA\[)")
+SPECIAL_CHARS = set("\n\\`*_[]!&<")
+
+
+def _decode_entity(ref: str) -> str:
+    """文字参照をデコード（不正な参照はNone）"""
+    body = ref[1:-1]
+    if body.startswith(("#x", "#X")):
+        code = int(body[2:], 16)
+    elif body.startswith("#"):
+        code = int(body[1:])
+    else:
+        return html5.get(body + ";")
+    if code == 0 or code > 0x10FFFF or 0xD800 <= code <= 0xDFFF:
+        return "\ufffd"
+    return chr(code)
+
+
+def _unescape(text: str) -> str:
+    """バックスラッシュエスケープと文字参照を解除（リンク先・タイトル用）"""
+    def _replace(match):
+        token = match.group(0)
+        if token.startswith("\\"):
+            return token[1]
+        decoded = _decode_entity(token)
+        return token if decoded is None else decoded
+
+    return re.sub(r"\\[!-/:-@\[-`{-~]|" + ENTITY_RE.pattern, _replace, text)
+
+
+class InlineParser:
+    """CommonMark仕様の区切り文字スタックによるインライン解析"""
+
+    def parse(self, text: str) -> list:
+        self.subject = text
+        self.pos = 0
+        self.root = Inline("root")
+        self.delimiters = []   # 強調の区切り文字（"*" / "_"）
+        self.brackets = []     # リンク・画像の開き括弧
+        while self.pos < len(self.subject):
+            self._parse_one()
+        self._process_emphasis(0)
+        return self.root.children
+
+    def _text(self, value: str) -> Inline:
+        node = Inline("text", value)
+        self.root.children.append(node)
+        return node
+
+    def _parse_one(self):
+        ch = self.subject[self.pos]
+        if ch == "\n":
+            self._newline()
+        elif ch == "\\":
+            self._backslash()
+        elif ch == "`":
+            self._code_span()
+        elif ch in "*_":
+            self._delimiter_run(ch)
+        elif ch == "[":
+            self.pos += 1
+            node = self._text("[")
+            self.brackets.append({"node": node, "image": False, "active": True, "delimiters": len(self.delimiters)})
+        elif ch == "!" and self.subject[self.pos + 1:self.pos + 2] == "[":
+            self.pos += 2
+            node = self._text("![")
+            self.brackets.append({"node": node, "image": True, "active": True, "delimiters": len(self.delimiters)})
+        elif ch == "]":
+            self._close_bracket()
+        elif ch == "&":
+            match = ENTITY_RE.match(self.subject, self.pos)
+            decoded = _decode_entity(match.group(0)) if match else None
+            if decoded is not None:
+                self.pos = match.end()
+                self._text(decoded)
+            else:
+                self.pos += 1
+                self._text("&")
+        elif ch == "<":
+            self._angle()
+        else:
+            end = self.pos + 1
+            while end < len(self.subject) and self.subject[end] not in SPECIAL_CHARS:
+                end += 1
+            self._text(self.subject[self.pos:end])
+            self.pos = end
+
+    def _newline(self):
+        self.pos += 1
+        last = self.root.children[-1] if self.root.children else None
+        hard = False
+        if last is not None and last.kind == "text" and last.value.endswith(" "):
+            hard = last.value.endswith("  ")
+            last.value = last.value.rstrip(" ")
+        self.root.children.append(Inline("break" if hard else "softbreak"))
+        while self.subject[self.pos:self.pos + 1] == " ":
+            self.pos += 1
+
+    def _backslash(self):
+        following = self.subject[self.pos + 1:self.pos + 2]
+        if following == "\n":
+            self.pos += 2
+            self.root.children.append(Inline("break"))
+            while self.subject[self.pos:self.pos + 1] == " ":
+                self.pos += 1
+        elif following in ASCII_PUNCTUATION and following:
+            self.pos += 2
+            self._text(following)
+        else:
+            self.pos += 1
+            self._text("\\")
+
+    def _code_span(self):
+        start = self.pos
+        while self.subject[self.pos:self.pos + 1] == "`":
+            self.pos += 1
+        ticks = self.subject[start:self.pos]
+        search = self.pos
+        while True:
+            match = re.compile(r"`+").search(self.subject, search)
+            if not match:
+                self._text(ticks)
+                return
+            if match.group(0) == ticks:
+                content = self.subject[self.pos:match.start()].replace("\n", " ")
+                if len(content) > 2 and content[0] == " " and content[-1] == " " and content.strip(" "):
+                    content = content[1:-1]
+                self.root.children.append(Inline("code", content))
+                self.pos = match.end()
+                return
+            search = match.end()
+
+    def _delimiter_run(self, ch: str):
+        start = self.pos
+        while self.subject[self.pos:self.pos + 1] == ch:
+            self.pos += 1
+        before = self.subject[start - 1] if start > 0 else "\n"
+        after = self.subject[self.pos] if self.pos < len(self.subject) else "\n"
+
+        left_flanking = not _is_whitespace(after) and (
+            not _is_punctuation(after) or _is_whitespace(before) or _is_punctuation(before)
+        )
+        right_flanking = not _is_whitespace(before) and (
+            not _is_punctuation(before) or _is_whitespace(after) or _is_punctuation(after)
+        )
+        if ch == "_":
+            can_open = left_flanking and (not right_flanking or _is_punctuation(before))
+            can_close = right_flanking and (not left_flanking or _is_punctuation(after))
+        else:
+            can_open, can_close = left_flanking, right_flanking
+
+        node = self._text(self.subject[start:self.pos])
+        self.delimiters.append({
+            "char": ch, "node": node, "count": self.pos - start, "original": self.pos - start,
+            "open": can_open, "close": can_close,
+        })
+
+    def _angle(self):
+        match = AUTOLINK_RE.match(self.subject[self.pos:])
+        if match:
+            url = match.group(1)
+            self._autolink(url, url)
+            self.pos += len(match.group(0))
+            return
+        match = EMAIL_AUTOLINK_RE.match(self.subject[self.pos:])
+        if match:
+            self._autolink("mailto:" + match.group(1), match.group(1))
+            self.pos += len(match.group(0))
+            return
+        if HTML_TAG_RE.match(self.subject[self.pos:]):
+            raise UnsupportedMarkdown("インラインHTML")
+        self.pos += 1
+        self._text("<")
+
+    def _autolink(self, url: str, label: str):
+        node = Inline("link", url=url, title=None)
+        node.children.append(Inline("text", label))
+        self.root.children.append(node)
+
+    # ---- リンク --------------------------------------------------------------
+
+    def _link_destination(self, pos: int):
+        subject = self.subject
+        if subject[pos:pos + 1] == "<":
+            end = pos + 1
+            while end < len(subject) and subject[end] not in "<>\n":
+                end += 2 if subject[end] == "\\" else 1
+            if subject[end:end + 1] != ">":
+                return None, pos
+            return _unescape(subject[pos + 1:end]), end + 1
+        depth = 0
+        end = pos
+        while end < len(subject):
+            ch = subject[end]
+            if ch == "\\" and subject[end + 1:end + 2] in ASCII_PUNCTUATION and subject[end + 1:end + 2]:
+                end += 2
+                continue
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                if depth == 0:
+                    break
+                depth -= 1
+            elif ch.isspace() or ord(ch) < 0x20:
+                break
+            end += 1
+        if end == pos or depth != 0:
+            return None, pos
+        return _unescape(subject[pos:end]), end
+
+    def _link_title(self, pos: int):
+        subject = self.subject
+        opener = subject[pos:pos + 1]
+        closer = {'"': '"', "'": "'", "(": ")"}.get(opener)
+        if not closer:
+            return None, pos
+        end = pos + 1
+        while end < len(subject):
+            ch = subject[end]
+            if ch == "\\":
+                end += 2
+                continue
+            if ch == closer:
+                return _unescape(subject[pos + 1:end]), end + 1
+            if opener == "(" and ch == "(":
+                return None, pos
+            end += 1
+        return None, pos
+
+    def _skip_spaces(self, pos: int) -> int:
+        newline = False
+        while pos < len(self.subject) and self.subject[pos] in " \n":
+            if self.subject[pos] == "\n":
+                if newline:
+                    break
+                newline = True
+            pos += 1
+        return pos
+
+    def _inline_link(self, pos: int):
+        """"(" の直後から リンク先・タイトル・")" を読む（失敗時はNone）"""
+        pos = self._skip_spaces(pos)
+        if self.subject[pos:pos + 1] == ")":
+            return "", None, pos + 1
+        destination, after = self._link_destination(pos)
+        if destination is None:
+            return None
+        pos = after
+        title = None
+        spaced = self._skip_spaces(pos)
+        if spaced != pos:
+            title, after_title = self._link_title(spaced)
+            if title is not None:
+                pos = after_title
+            pos = self._skip_spaces(pos)
+        if self.subject[pos:pos + 1] != ")":
+            return None
+        return destination, title, pos + 1
+
+    def _close_bracket(self):
+        self.pos += 1
+        if not self.brackets:
+            self._text("]")
+            return
+        opener = self.brackets.pop()
+        if not opener["active"]:
+            self._text("]")
+            return
+
+        link = None
+        if self.subject[self.pos:self.pos + 1] == "(":
+            link = self._inline_link(self.pos + 1)
+        if link is None:
+            # 参照リンクの定義は扱わないため、そのまま文字として残す
+            self._text("]")
+            return
+
+        destination, title, end = link
+        self.pos = end
+        node = Inline("image" if opener["image"] else "link", url=destination, title=title)
+        index = self.root.children.index(opener["node"])
+        node.children = self.root.children[index + 1:]
+        self.root.children = self.root.children[:index] + [node]
+
+        # 括弧内の強調を先に処理し、内側の子に入れる
+        saved_root = self.root
+        self.root = node
+        self._process_emphasis(opener["delimiters"])
+        self.root = saved_root
+
+        if not opener["image"]:
+            for bracket in self.brackets:
+                if not bracket["image"]:
+                    bracket["active"] = False
+
+    # ---- 強調 ----------------------------------------------------------------
+
+    def _process_emphasis(self, bottom: int):
+        delimiters = self.delimiters
+        openers_bottom = {}
+        current = bottom
+        while current < len(delimiters):
+            closer = delimiters[current]
+            if not closer["close"]:
+                current += 1
+                continue
+            key = (closer["char"], closer["open"], closer["original"] % 3)
+            lower = max(bottom, openers_bottom.get(key, bottom))
+            opener_index = None
+            for index in range(current - 1, lower - 1, -1):
+                opener = delimiters[index]
+                if opener["char"] != closer["char"] or not opener["open"]:
+                    continue
+                odd_match = (opener["close"] or closer["open"]) and \
+                    (opener["original"] + closer["original"]) % 3 == 0 and \
+                    not (opener["original"] % 3 == 0 and closer["original"] % 3 == 0)
+                if not odd_match:
+                    opener_index = index
+                    break
+
+            if opener_index is None:
+                openers_bottom[key] = current
+                if not closer["open"]:
+                    del delimiters[current]
+                else:
+                    current += 1
+                continue
+
+            opener = delimiters[opener_index]
+            used = 2 if opener["count"] >= 2 and closer["count"] >= 2 else 1
+            opener["count"] -= used
+            closer["count"] -= used
+            opener["node"].value = opener["node"].value[:opener["count"]]
+            closer["node"].value = closer["node"].value[:closer["count"]]
+
+            # 開き・閉じの間のノードを強調ノードに入れる
+            container = self._container_of(opener["node"])
+            siblings = container.children
+            start = siblings.index(opener["node"]) + 1
+            end = siblings.index(closer["node"])
+            node = Inline("strong" if used == 2 else "emphasis")
+            node.children = siblings[start:end]
+            siblings[start:end] = [node]
+
+            del delimiters[opener_index + 1:current]
+            current = opener_index + 1
+            if opener["count"] == 0:
+                siblings.remove(opener["node"])
+                del delimiters[opener_index]
+                current -= 1
+            if closer["count"] == 0:
+                siblings.remove(closer["node"])
+                del delimiters[current]
+
+        del delimiters[bottom:]
+
+    def _container_of(self, target: Inline) -> Inline:
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if any(child is target for child in node.children):
+                return node
+            stack.extend(node.children)
+        raise ValueError("delimiter node not found")
+
+
+# =============================================================================
+# HTMLへの変換（mdast-util-to-hast の出力形式）
+# =============================================================================
+
+def _plain_text(nodes: list) -> str:
+    parts = []
+    for node in nodes:
+        if node.kind in ("text", "code"):
+            parts.append(node.value)
+        elif node.kind in ("softbreak", "break"):
+            parts.append("\n")
+        else:
+            parts.append(_plain_text(node.children))
+    return "".join(parts)
+
+
+def _trim_lines(value: str) -> str:
+    """改行の前後の空白を除く（mdast-util-to-hast の trimLines）"""
+    return re.sub(r"[ \t]*\n[ \t]*", "\n", value)
+
+
+def _render_inlines(nodes: list) -> str:
+    parts = []
+    for node in nodes:
+        if node.kind == "text":
+            parts.append(_escape_text(node.value))
+        elif node.kind == "softbreak":
+            parts.append("\n")
+        elif node.kind == "break":
+            parts.append("<br>\n")
+        elif node.kind == "code":
+            parts.append(f"<code>{_escape_text(node.value)}</code>")
+        elif node.kind == "emphasis":
+            parts.append(f"<em>{_render_inlines(node.children)}</em>")
+        elif node.kind == "strong":
+            parts.append(f"<strong>{_render_inlines(node.children)}</strong>")
+        elif node.kind == "link":
+            href = _safe_url(normalize_uri(node.attrs["url"]), "href")
+            attrs = _attributes([("href", href), ("title", node.attrs["title"])])
+            parts.append(f"<a{attrs}>{_render_inlines(node.children)}</a>")
+        elif node.kind == "image":
+            src = _safe_url(normalize_uri(node.attrs["url"]), "src")
+            attrs = _attributes([("src", src), ("alt", _plain_text(node.children)), ("title", node.attrs["title"])])
+            parts.append(f"<img{attrs}>")
+    return "".join(parts)
+
+
+def _inline_html(content: str) -> tuple:
+    """段落・見出しの内容を (HTML, プレーンテキスト) にする"""
+    nodes = InlineParser().parse(content.strip(" \n"))
+    # 改行前後の空白は出力しない
+    for node in nodes:
+        if node.kind == "text":
+            node.value = _trim_lines(node.value)
+    return _render_inlines(nodes), _plain_text(nodes)
+
+
+class _Renderer:
+    def __init__(self, slugify):
+        self.slugify = slugify
+        self.headings = []
+        self.used_ids = {}
+
+    def block(self, block: Block, tight: bool = False) -> str:
+        kind = block.kind
+        if kind == "paragraph":
+            inner, _ = _inline_html(block.content)
+            return inner if tight else f"<p>{inner}</p>"
+        if kind == "heading":
+            inner, text = _inline_html(block.content)
+            anchor = self._anchor(text.strip())
+            self.headings.append({"id": anchor, "text": text.strip(), "level": block.level})
+            return f'<h{block.level} id="{_escape_attribute(anchor)}">{inner}</h{block.level}>'
+        if kind == "thematic_break":
+            return "<hr>"
+        if kind == "block_quote":
+            return self._wrap("blockquote", "", [self.block(child) for child in block.children])
+        if kind == "code_block":
+            value = block.content[:-1] if block.content.endswith("\n") else block.content
+            language = _unescape(block.info.split(" ")[0]) if block.info else ""
+            attrs = _attributes([("class", f"language-{language}" if language else None)])
+            code = _escape_text(value + "\n") if value else ""
+            return f"<pre><code{attrs}>{code}</code></pre>"
+        if kind == "list":
+            data = block.list_data
+            tag = "ol" if data["ordered"] else "ul"
+            start = data["start"] if data["ordered"] and data["start"] != 1 else None
+            attrs = _attributes([("start", str(start) if start is not None else None)])
+            items = [self._item(item, loose=not block.tight) for item in block.children]
+            return self._wrap(tag, attrs, items)
+        return ""
+
+    def _item(self, item: Block, loose: bool) -> str:
+        parts = []
+        for index, child in enumerate(item.children):
+            is_paragraph = child.kind == "paragraph"
+            if loose or index != 0 or not is_paragraph:
+                parts.append("\n")
+            parts.append(self.block(child, tight=not loose))
+        if item.children and (loose or item.children[-1].kind != "paragraph"):
+            parts.append("\n")
+        return f"<li>{''.join(parts)}</li>"
+
+    @staticmethod
+    def _wrap(tag: str, attrs: str, children: list) -> str:
+        if not children:
+            return f"<{tag}{attrs}>\n</{tag}>"
+        return f"<{tag}{attrs}>\n" + "\n".join(children) + f"\n</{tag}>"
+
+    def _anchor(self, text: str) -> str:
+        anchor = self.slugify(text) or f"section-{len(self.headings) + 1}"
+        if anchor in self.used_ids:
+            self.used_ids[anchor] += 1
+            anchor = f"{anchor}-{self.used_ids[anchor]}"
+        else:
+            self.used_ids[anchor] = 1
+        return anchor
+
+
+def render(markdown: str, slugify) -> tuple:
+    """Markdownを (HTML, 見出しリスト) に変換（slugify: 見出しテキスト → アンカーID）"""
+    doc = BlockParser().parse(markdown)
+    renderer = _Renderer(slugify)
+    blocks = [renderer.block(child) for child in doc.children]
+    result = "\n".join(block for block in blocks if block)
+    return (result + "\n" if result else ""), renderer.headings
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+実行結果の通知（Discord Webhook）
+- 通知はキューに積むだけで、送信はバックグラウンドのスレッドが行う
+  （生成処理を待たせない・送信に失敗しても生成は失敗しない）
+- 短時間に続いた通知（複数サイトの一括生成など）は1メッセージにまとめる
+- 429（レート制限）は retry_after に従って再送、5xx・通信エラーは指数バックオフで再送
+- DISCORD_WEBHOOK_URL が未設定なら何もしない
+
+ローカルで確認する場合:
+    python scripts/notifications.py --stub-server --rate-limit-every 3
+    python scripts/notifications.py --send-test --url http://127.0.0.1:8765/webhook --count 12
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import random
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from pipeline_logging import get_logger
+
+logger = get_logger("notify")
+
+# 通知設定
+WEBHOOK_ENV = "DISCORD_WEBHOOK_URL"
+USERNAME = "Ennek Lab Bot"
+COALESCE_WINDOW = 2.0
+MAX_EMBEDS = 10
+MAX_ATTEMPTS = 5
+REQUEST_TIMEOUT = 10
+MAX_RETRY_DELAY = 30.0
+SHUTDOWN_TIMEOUT = 15.0
+
+COLOR_SUCCESS = 0x2ECC71
+COLOR_FAILURE = 0xE74C3C
+
+_STOP = object()
+
+
+class DiscordNotifier:
+    """Discord Webhookへの非同期・まとめ送信"""
+
+    def __init__(self, webhook_url: str = None, coalesce_window: float = COALESCE_WINDOW,
+                 max_attempts: int = MAX_ATTEMPTS, username: str = USERNAME):
+        self.webhook_url = webhook_url
+        self.coalesce_window = coalesce_window
+        self.max_attempts = max_attempts
+        self.username = username
+        self.sent = 0
+        self.dropped = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._session = None
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "DiscordNotifier":
+        return cls(os.getenv(WEBHOOK_ENV), **kwargs)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.webhook_url)
+
+    def start(self) -> "DiscordNotifier":
+        if self.enabled and self._thread is None:
+            self._session = requests.Session()
+            self._thread = threading.Thread(target=self._run, name="discord-notifier", daemon=True)
+            self._thread.start()
+        return self
+
+    def notify(self, embed: dict):
+        """通知をキューに積む（すぐに戻る）"""
+        if not self.enabled:
+            return
+        self.start()
+        self._queue.put(embed)
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """キューに残った通知を送り切ってスレッドを止める（最大 timeout 秒）"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"⚠️ 通知の送信が{timeout:.0f}秒以内に終わりませんでした")
+        else:
+            self._session.close()
+        self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            # 最初の通知から一定時間内に届いたものをまとめる
+            batch = [item]
+            deadline = time.monotonic() + self.coalesce_window
+            while len(batch) < MAX_EMBEDS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._send(batch)
+            except Exception as e:
+                self.dropped += len(batch)
+                logger.warning(f"⚠️ 通知エラー: {e}")
+
+    def _send(self, batch: list) -> bool:
+        payload = {"username": self.username, "embeds": batch}
+        for attempt in range(self.max_attempts):
+            try:
+                response = self._session.post(self.webhook_url, json=payload, timeout=REQUEST_TIMEOUT)
+            except requests.RequestException as e:
+                delay = _backoff(attempt)
+                logger.warning(f"⚠️ 通知の送信エラー（{delay:.1f}秒後に再送）: {e}")
+                time.sleep(delay)
+                continue
+
+            if response.ok:
+                self.sent += len(batch)
+                logger.debug(f"通知を送信しました（{len(batch)}件）")
+                self._wait_for_bucket(response)
+                return True
+
+            if response.status_code == 429:
+                delay = _retry_after(response, attempt)
+                logger.warning(f"⚠️ 通知がレート制限されました（{delay:.1f}秒後に再送）")
+            elif response.status_code >= 500:
+                delay = _backoff(attempt)
+                logger.warning(f"⚠️ 通知先のエラー {response.status_code}（{delay:.1f}秒後に再送）")
+            else:
+                # 400番台（URL・内容の誤り）は再送しても成功しない
+                logger.warning(f"⚠️ 通知が拒否されました {response.status_code}: {response.text[:200]}")
+                self.dropped += len(batch)
+                return False
+            time.sleep(delay)
+
+        logger.warning(f"⚠️ 通知を{self.max_attempts}回送信できなかったため破棄しました")
+        self.dropped += len(batch)
+        return False
+
+    def _wait_for_bucket(self, response: requests.Response):
+        """残り回数が0なら、リセットまで次の送信を待つ"""
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset_after = float(response.headers.get("X-RateLimit-Reset-After", 0))
+            except ValueError:
+                return
+            time.sleep(min(reset_after, MAX_RETRY_DELAY))
+
+
+def _backoff(attempt: int) -> float:
+    return min(MAX_RETRY_DELAY, (2 ** attempt) + random.random())
+
+
+def _retry_after(response: requests.Response, attempt: int) -> float:
+    """429の待ち時間（本文の retry_after → Retry-Afterヘッダー → バックオフ）"""
+    try:
+        delay = float(response.json().get("retry_after"))
+    except (ValueError, TypeError, AttributeError):
+        try:
+            delay = float(response.headers.get("Retry-After"))
+        except (ValueError, TypeError):
+            delay = _backoff(attempt)
+    return min(MAX_RETRY_DELAY, max(0.0, delay))
+
+
+def _format_timings(timings: dict) -> str:
+    if not timings:
+        return "-"
+    return "\n".join(f"{stage}: {seconds:.1f}s" for stage, seconds in timings.items())
+
+
+def success_embed(site_name: str, article: dict, timings: dict = None, url: str = None) -> dict:
+    """生成成功の通知"""
+    fields = [
+        {"name": "カテゴリ", "value": article.get("category_name", "-"), "inline": True},
+        {"name": "文字数", "value": f"{article.get('char_count', 0):,}字", "inline": True},
+        {"name": "試行回数", "value": str(article.get("attempts", 1)), "inline": True},
+        {"name": "ステージ", "value": _format_timings(timings), "inline": False},
+    ]
+    embed = {
+        "title": f"✅ [{site_name}] {article.get('title', '')}"[:256],
+        "color": COLOR_SUCCESS,
+        "fields": fields,
+        "timestamp": datetime.now().astimezone().isoformat(),
+    }
+    if url:
+        embed["url"] = url
+    return embed
+
+
+def failure_embed(site_name: str, error: BaseException, timings: dict = None, attempts: int = None) -> dict:
+    """生成失敗の通知"""
+    fields = [
+        {"name": "エラー", "value": f"{type(error).__name__}: {error}"[:1024], "inline": False},
+        {"name": "試行回数", "value": str(attempts or "-"), "inline": True},
+        {"name": "ステージ", "value": _format_timings(timings), "inline": False},
+    ]
+    return {
+        "title": f"❌ [{site_name}] 記事生成に失敗しました"[:256],
+        "color": COLOR_FAILURE,
+        "fields": fields,
+        "timestamp": datetime.now().astimezone().isoformat(),
+    }
+
+
+# =============================================================================
+# ローカル確認用
+# =============================================================================
+
+class _StubWebhookHandler(BaseHTTPRequestHandler):
+    """Discord Webhookの代わりに受信内容を表示するハンドラ"""
+
+    rate_limit_every = 0
+    received = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            type(self).received += 1
+            count = type(self).received
+
+        if self.rate_limit_every and count % self.rate_limit_every == 0:
+            self._respond(429, {"message": "You are being rate limited.", "retry_after": 0.5, "global": False})
+            print(f"#{count} 429 を返しました")
+            return
+
+        payload = json.loads(body or b"{}")
+        titles = [embed.get("title") for embed in payload.get("embeds", [])]
+        print(f"#{count} {len(titles)}件: {titles}")
+        self._respond(204)
+
+    def _respond(self, status: int, body: dict = None):
+        data = json.dumps(body).encode('utf-8') if body else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_stub(port: int, rate_limit_every: int = 0):
+    _StubWebhookHandler.rate_limit_every = rate_limit_every
+    server = ThreadingHTTPServer(("127.0.0.1", port), _StubWebhookHandler)
+    print(f"📮 スタブWebhook: http://127.0.0.1:{port}/webhook")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Discord通知の確認")
+    parser.add_argument("--stub-server", action="store_true", help="受信内容を表示するスタブWebhookを起動")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="スタブがN回に1回429を返す")
+    parser.add_argument("--send-test", action="store_true", help="テスト通知をまとめて送る")
+    parser.add_argument("--url", default=os.getenv(WEBHOOK_ENV), help=f"送信先（既定: {WEBHOOK_ENV}）")
+    parser.add_argument("--count", type=int, default=3, help="テスト通知の件数")
+    args = parser.parse_args()
+
+    if args.stub_server:
+        serve_stub(args.port, args.rate_limit_every)
+        return 0
+
+    if args.send_test:
+        if not args.url:
+            print(f"❌ 送信先がありません（--url か {WEBHOOK_ENV}）")
+            return 1
+        from pipeline_logging import setup_logging
+
+        setup_logging("notify")
+        notifier = DiscordNotifier(args.url).start()
+        start = time.perf_counter()
+        for i in range(args.count):
+            article = {"title": f"テスト通知 {i + 1}", "category_name": "テスト", "char_count": 5000}
+            notifier.notify(success_embed("test", article, {"part1": 1.0, "part2": 1.0}))
+        print(f"キューに積むまで: {(time.perf_counter() - start) * 1000:.1f}ms")
+        notifier.close()
+        print(f"送信: {notifier.sent}件 / 破棄: {notifier.dropped}件")
+        return 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,70 +2,134 @@
 """
 Obsidian同期ランナー
 LaunchAgentから直接呼び出されるエントリーポイント
-Git pull + Obsidian同期を実行
+Git pull + Obsidian同期を実行（ログは pipeline_logging のJSON Lines）
+
+--sparse を付けると、リポジトリ全体をpullせずに content/posts だけの
+浅い（depth 1）・blobless・スパースなチェックアウトを別ディレクトリに保持し、
+そこから同期する（画像やビルド設定は転送しない）
 """
 
 import os
 import sys
+import shutil
+import argparse
 import subprocess
-from datetime import datetime
 from pathlib import Path
 
-# ログ設定
-LOG_DIR = Path.home() / ".logs" / "relationship-blog"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-LOG_FILE = LOG_DIR / f"sync_{datetime.now().strftime('%Y-%m-%d')}.log"
+from pipeline_logging import LOG_DIR, get_logger, setup_logging, log_stage
+from pipeline_profiling import add_profile_argument, enable_profiling_from_args
+
+logger = get_logger("sync")
+
+# スパースモード用のチェックアウト先と対象パス
+SPARSE_CHECKOUT_DIR = Path(os.getenv(
+    "BLOG_SPARSE_CHECKOUT_DIR",
+    Path.home() / ".cache" / "relationship-blog" / "posts-checkout"
+))
+SPARSE_PATHS = ["content/posts"]
+SYNC_BRANCH = "main"
+
+def run_git(args: list, cwd: Path, check: bool = False) -> subprocess.CompletedProcess:
+    """gitコマンドを実行し、失敗時はstderrをログに残す（check=Trueなら例外）"""
+    result = subprocess.run(
+        ['git'] + args,
+        capture_output=True,
+        text=True,
+        cwd=cwd
+    )
+    if result.returncode != 0:
+        if check:
+            raise RuntimeError(f"git {args[0]}に失敗しました: {result.stderr.strip()}")
+        logger.warning(f"⚠️ git {args[0]}エラー: {result.stderr.strip()}")
+    return result
 
-def log(message: str):
-    """ログ出力"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    log_message = f"[{timestamp}] {message}"
-    print(log_message)
-    with open(LOG_FILE, 'a', encoding='utf-8') as f:
-        f.write(log_message + '\n')
+def update_sparse_checkout(project_dir: Path) -> Path:
+    """content/postsだけのスパースチェックアウトを作成・更新し、記事ディレクトリを返す
+
+    clone / sparse-checkout / fetch に失敗した場合はRuntimeError（古い記事で同期しない）
+    """
+    checkout_dir = SPARSE_CHECKOUT_DIR
+    
+    if not (checkout_dir / '.git').exists():
+        remote = run_git(['remote', 'get-url', 'origin'], project_dir, check=True).stdout.strip()
+        logger.info(f"📦 スパースチェックアウトを作成: {checkout_dir}")
+        checkout_dir.parent.mkdir(parents=True, exist_ok=True)
+        run_git([
+            'clone', '--depth', '1', '--filter=blob:none', '--sparse',
+            '--branch', SYNC_BRANCH, remote, str(checkout_dir)
+        ], checkout_dir.parent, check=True)
+        try:
+            run_git(['sparse-checkout', 'set', '--cone'] + SPARSE_PATHS, checkout_dir, check=True)
+        except RuntimeError:
+            # 中途半端なチェックアウトを残すと次回fetchだけで済ませてしまうため作り直させる
+            shutil.rmtree(checkout_dir, ignore_errors=True)
+            raise
+    else:
+        # 最新コミットだけを取得し、必要なblob（content/posts）のみ展開する
+        logger.info("📥 Git fetch（スパース）実行中...")
+        run_git([
+            'fetch', '--depth', '1', '--filter=blob:none', 'origin', SYNC_BRANCH
+        ], checkout_dir, check=True)
+        run_git(['reset', '--hard', 'FETCH_HEAD'], checkout_dir, check=True)
+    
+    head = run_git(['log', '-1', '--format=%h %s'], checkout_dir).stdout.strip()
+    logger.info(f"Git fetch: {head}")
+    return checkout_dir / 'content' / 'posts'
+
+def pull_full_repository(project_dir: Path):
+    """リポジトリ全体をpull（従来モード）"""
+    logger.info("📥 Git pull実行中...")
+    try:
+        result = run_git(['pull', 'origin', SYNC_BRANCH], project_dir)
+        logger.info(f"Git pull: {result.stdout.strip()}")
+    except Exception as e:
+        logger.error(f"❌ Git pullエラー: {e}")
 
 def main():
-    log("=" * 50)
-    log("🚀 Obsidian同期開始")
-    log("=" * 50)
+    parser = argparse.ArgumentParser(description="GitHubの記事をObsidian Vaultに同期")
+    parser.add_argument("--sparse", action="store_true",
+                        help="content/postsだけのスパースチェックアウトから同期する")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    
+    setup_logging("sync")
+    profile_dir = enable_profiling_from_args(args.profile, LOG_DIR, "sync")
+    if profile_dir:
+        logger.info(f"🔬 プロファイル出力先: {profile_dir}")
+    
+    logger.info("=" * 50)
+    logger.info("🚀 Obsidian同期開始")
+    logger.info("=" * 50)
     
     project_dir = Path(__file__).parent.parent
     os.chdir(project_dir)
     
-    # Git pull
-    log("📥 Git pull実行中...")
-    try:
-        result = subprocess.run(
-            ['git', 'pull', 'origin', 'main'],
-            capture_output=True,
-            text=True,
-            cwd=project_dir
-        )
-        log(f"Git pull: {result.stdout.strip()}")
-        if result.returncode != 0:
-            log(f"⚠️ Git pullエラー: {result.stderr}")
-    except Exception as e:
-        log(f"❌ Git pullエラー: {e}")
+    posts_dir = None
+    with log_stage(logger, "git"):
+        if args.sparse:
+            try:
+                posts_dir = update_sparse_checkout(project_dir)
+            except Exception as e:
+                # リポジトリ側の（古い）記事にフォールバックせず、今回の同期はスキップ
+                logger.error(f"❌ スパースチェックアウトエラーのため同期をスキップします: {e}")
+                return 1
+        else:
+            pull_full_repository(project_dir)
     
     # Obsidian同期
-    log("📚 Obsidianに同期中...")
+    logger.info("📚 Obsidianに同期中...")
     try:
         # sync_to_obsidian.pyをインポートして実行
         sys.path.insert(0, str(project_dir / 'scripts'))
         from sync_to_obsidian import sync_articles
-        sync_articles()
+        with log_stage(logger, "obsidian"):
+            sync_articles(posts_dir)
     except Exception as e:
-        log(f"❌ 同期エラー: {e}")
-        import traceback
-        log(traceback.format_exc())
-    
-    log("✅ 完了")
-    log("")
+        logger.exception(f"❌ 同期エラー: {e}")
     
-    # 古いログを削除（30日以上）
-    for old_log in LOG_DIR.glob("sync_*.log"):
-        if (datetime.now() - datetime.fromtimestamp(old_log.stat().st_mtime)).days > 30:
-            old_log.unlink()
+    logger.info("✅ 完了")
+    logger.info("")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+パイプライン共通ロギング
+- コンソール（標準出力）には従来どおりメッセージだけを表示
+- ファイルにはJSON Lines形式で出力（キュー経由で別スレッドが書き込み）
+- ファイルは開いたままバッファリング（1行ごとのopen/close・flushをしない）
+- 日付が変わる・サイズ上限を超えるとローテーション
+- 保持期間を過ぎたログはファイル名の日付で判定して削除（statしない）
+  （以前のテキスト形式のログ {prefix}_YYYY-MM-DD.log も同じ基準で削除）
+- イベント項目: run_id / stage / slug / duration_ms など
+
+使い方:
+    logger = setup_logging("generate")
+    with log_stage(logger, "part1", slug=slug):
+        ...
+    shutdown_logging()
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import logging.handlers
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from pipeline_profiling import profile_stage
+
+# ログ設定
+LOG_SUFFIXES = (".jsonl", ".log")
+LOG_DIR = Path(os.getenv("BLOG_LOG_DIR", Path.home() / ".logs" / "relationship-blog"))
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_RETENTION_DAYS = 30
+LOG_BUFFER_SIZE = 64 * 1024
+
+# パイプライン全体の親ロガー（各スクリプトは "blog.xxx" を使う）
+ROOT_LOGGER_NAME = "blog"
+
+# JSONに含めるイベント項目（logger.info(..., extra={...}) で渡す）
+EVENT_FIELDS = ("run_id", "site", "stage", "slug", "category", "attempt", "duration_ms", "status")
+
+_listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """パイプライン配下のロガーを取得"""
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """1レコードを1行のJSONに変換"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in EVENT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class JsonLinesFileHandler(logging.Handler):
+    """日付・サイズでローテーションするバッファ付きファイルハンドラ
+
+    ファイル名は {prefix}_{YYYY-MM-DD}.jsonl、サイズ超過時は
+    {prefix}_{YYYY-MM-DD}.{n}.jsonl に退避する。
+    """
+
+    def __init__(self, log_dir: Path, prefix: str, max_bytes: int = LOG_MAX_BYTES,
+                 retention_days: int = LOG_RETENTION_DAYS, buffer_size: int = LOG_BUFFER_SIZE):
+        super().__init__()
+        self.log_dir = Path(log_dir)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self.buffer_size = buffer_size
+        self._stream = None
+        self._date = None
+        self._size = 0
+
+    def _path_for(self, date: str, part: int = 0) -> Path:
+        suffix = f".{part}" if part else ""
+        return self.log_dir / f"{self.prefix}_{date}{suffix}.jsonl"
+
+    def _open(self, date: str):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path_for(date)
+        self._stream = open(path, 'a', encoding='utf-8', buffering=self.buffer_size)
+        self._size = self._stream.tell()
+        if date != self._date:
+            self._date = date
+            self._prune()
+
+    def _close_stream(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+
+    def _rollover(self):
+        """サイズ超過時に現在のファイルを連番付きで退避"""
+        self._close_stream()
+        part = 1
+        while self._path_for(self._date, part).exists():
+            part += 1
+        self._path_for(self._date).rename(self._path_for(self._date, part))
+
+    def _prune(self):
+        """保持期間を過ぎたログを削除（ファイル名の日付で判定）"""
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for suffix in LOG_SUFFIXES:
+            for path in self.log_dir.glob(f"{self.prefix}_*{suffix}"):
+                date = path.name[len(self.prefix) + 1:len(self.prefix) + 11]
+                if date < cutoff:
+                    path.unlink(missing_ok=True)
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = self.format(record) + "\n"
+            size = len(line.encode('utf-8'))
+            today = datetime.now().strftime("%Y-%m-%d")
+
+            if self._stream is None or today != self._date:
+                self._close_stream()
+                self._open(today)
+            elif self._size + size > self.max_bytes and self._size > 0:
+                self._rollover()
+                self._open(today)
+
+            self._stream.write(line)
+            self._size += size
+            # エラーだけは即座に書き出す（異常終了時に失わないため）
+            if record.levelno >= logging.ERROR:
+                self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        if self._stream:
+            self._stream.flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._close_stream()
+        finally:
+            self.release()
+        super().close()
+
+
+class _PreparedQueueHandler(logging.handlers.QueueHandler):
+    """例外情報をJSON用に文字列化してからキューに積む"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _RunIdFilter(logging.Filter):
+    def __init__(self, run_id: str):
+        super().__init__()
+        self.run_id = run_id
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = self.run_id
+        return True
+
+
+def setup_logging(prefix: str, log_dir: Path = LOG_DIR, console: bool = True,
+                  max_bytes: int = LOG_MAX_BYTES,
+                  retention_days: int = LOG_RETENTION_DAYS) -> logging.Logger:
+    """ロギングを初期化し、パイプラインの親ロガーを返す"""
+    global _listener
+
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    if _listener is not None:
+        return logger
+
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+    run_filter = _RunIdFilter(uuid.uuid4().hex[:12])
+
+    # ファイル出力は別スレッドで（呼び出し側はキューに積むだけ）
+    file_handler = JsonLinesFileHandler(log_dir, prefix, max_bytes, retention_days)
+    file_handler.setFormatter(JsonLinesFormatter())
+    log_queue = queue.SimpleQueue()
+    queue_handler = _PreparedQueueHandler(log_queue)
+    queue_handler.addFilter(run_filter)
+    logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _listener.start()
+
+    # コンソールは従来のprintと同じ見た目（ステージ計測などDEBUGは出さない）
+    if console:
+        # print() だった頃と同じく標準出力へ（auto_sync.sh は標準出力を捨てる）
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(console_handler)
+
+    atexit.register(shutdown_logging)
+    return logger
+
+
+def shutdown_logging():
+    """キューを書き切ってファイルを閉じる"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@contextmanager
+def log_stage(logger: logging.Logger, stage: str, timings: dict = None, **fields):
+    """処理時間を計測してステージ完了イベントを記録
+
+    timings を渡すと {stage: 秒} を書き込む（通知などで再利用するため）。
+    --profile 指定時は同じ単位で pipeline_profiling の計測も行う。
+    """
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        with profile_stage(stage):
+            yield fields
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + duration
+        logger.debug(
+            f"stage {stage} {status} ({duration:.3f}s)",
+            extra={"stage": stage, "duration_ms": round(duration * 1000, 1),
+                   "status": status, **fields},
+        )
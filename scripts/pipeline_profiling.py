@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+パイプライン共通プロファイリング（--profile 指定時のみ有効）
+- 各ステージ（log_stage の単位）を cProfile と tracemalloc で計測
+- 並行してスタックをサンプリングし、flamegraph用の collapsed 形式で保存
+- 出力はステージごとに以下のファイル（同じステージが複数回あれば連番）
+    {stage}.pstats        cProfileの結果（python -m pstats / snakeviz で閲覧）
+    {stage}.collapsed     サンプリングしたスタック（flamegraph.pl / speedscope）
+    {stage}.alloc.txt     メモリ確保の多い行とピーク使用量
+
+無効時は profile_stage() は何もしないので、通常実行のコストはない。
+"""
+
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# サンプリング間隔（秒）とメモリ確保レポートの件数
+SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 25
+
+_profiler = None
+
+
+class _StackSampler(threading.Thread):
+    """対象スレッドのスタックを一定間隔で記録するサンプラー"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class StageProfiler:
+    """ステージ単位でCPU・メモリを計測して出力するクラス"""
+
+    def __init__(self, out_dir: Path, sample_interval: float = SAMPLE_INTERVAL,
+                 top_allocations: int = TOP_ALLOCATIONS):
+        self.out_dir = Path(out_dir)
+        self.sample_interval = sample_interval
+        self.top_allocations = top_allocations
+        self._active = False
+        self._counts = Counter()
+
+    def _output_base(self, stage: str) -> Path:
+        self._counts[stage] += 1
+        count = self._counts[stage]
+        name = stage if count == 1 else f"{stage}.{count}"
+        return self.out_dir / name
+
+    @contextmanager
+    def stage(self, stage: str):
+        # ネストしたステージは外側の計測に含める（cProfileは同時に1つまで）
+        if self._active:
+            yield
+            return
+
+        self._active = True
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        base = self._output_base(stage)
+
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            sampler.stop()
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            self._active = False
+
+            profile.dump_stats(f"{base}.pstats")
+            self._write_collapsed(base, sampler.counts)
+            self._write_allocations(base, stage, elapsed, peak, before, after)
+
+    def _write_collapsed(self, base: Path, counts: Counter):
+        with open(f"{base}.collapsed", 'w', encoding='utf-8') as f:
+            for stack, count in counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _write_allocations(self, base: Path, stage: str, elapsed: float, peak: int,
+                           before: tracemalloc.Snapshot, after: tracemalloc.Snapshot):
+        # プロファイラ自身の確保は除外する
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+
+        with open(f"{base}.alloc.txt", 'w', encoding='utf-8') as f:
+            f.write(f"stage: {stage}\n")
+            f.write(f"elapsed: {elapsed:.3f}s\n")
+            f.write(f"peak traced memory: {peak / 1024:.1f} KiB\n\n")
+            f.write(f"top {self.top_allocations} allocation sites (net growth during stage):\n")
+            for stat in stats[:self.top_allocations]:
+                f.write(f"{stat}\n")
+
+            f.write("\ntop functions by cumulative time:\n")
+            summary = pstats.Stats(f"{base}.pstats", stream=f)
+            summary.sort_stats("cumulative").print_stats(self.top_allocations)
+
+
+def add_profile_argument(parser):
+    """--profile [DIR] オプションを追加"""
+    parser.add_argument(
+        "--profile", nargs="?", const="", default=None, metavar="DIR",
+        help="各ステージをcProfile/tracemallocで計測（既定の出力先: ログ/profiles/）",
+    )
+
+
+def enable_profiling(out_dir: Path) -> StageProfiler:
+    """プロファイリングを有効化"""
+    global _profiler
+    _profiler = StageProfiler(out_dir)
+    return _profiler
+
+
+def enable_profiling_from_args(profile_arg, log_dir: Path, prefix: str) -> Path:
+    """--profile の値に応じて有効化し、出力先を返す（未指定ならNone）"""
+    if profile_arg is None:
+        return None
+    out_dir = Path(profile_arg) if profile_arg else (
+        Path(log_dir) / "profiles" / f"{prefix}_{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    )
+    enable_profiling(out_dir)
+    return out_dir
+
+
+def profiling_enabled() -> bool:
+    return _profiler is not None
+
+
+@contextmanager
+def profile_stage(stage: str):
+    """有効時のみステージを計測する"""
+    if _profiler is None:
+        yield
+        return
+    with _profiler.stage(stage):
+        yield
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+記事ファイルの保存レイアウトとマニフェスト
+- 記事は年/月ごとのディレクトリに保存: content/posts/2026/01/2026-01-01.md
+- content/posts/manifest.json に slug → パス・ハッシュ・日付などを記録
+- 利用側はマニフェストから一覧・期間指定で記事を取得（記事ファイルを全件開かない）
+- マニフェストの更新時刻より新しい年/月ディレクトリだけ走査し直し、
+  それ以外の記事もファイルの更新時刻とサイズを確認する
+  （CMSやgit pull、手元での編集で追加・変更・削除された記事を取りこぼさない）
+- マニフェストがない場合は走査して組み立てる（旧来のフラット配置も読める）
+
+使い方:
+    python scripts/post_store.py --migrate --dry-run   # 移動内容の確認
+    python scripts/post_store.py --migrate             # フラット配置から年/月配置へ移行
+    python scripts/post_store.py --refresh             # 変わった記事だけマニフェストに反映
+    python scripts/post_store.py --rebuild             # 走査してマニフェストを作り直す
+    python scripts/post_store.py --refresh --site scripts/sites/other.json  # 別サイトの記事
+"""
+
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+from sync_to_obsidian import parse_frontmatter
+from site_config import DEFAULT_SITE, load_site
+
+# パス設定（scripts/sites/ennek.json）
+PROJECT_ROOT = Path(__file__).parent.parent
+POSTS_DIR = DEFAULT_SITE.posts_dir
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+DATE_PREFIX = re.compile(r"^(\d{4})-(\d{2})-\d{2}")
+
+
+def shard_for(slug: str, date: str = "") -> Path:
+    """記事の保存先ディレクトリ（posts直下からの相対パス）
+
+    スラッグ（なければ日付）の年月で分ける。どちらも日付でなければ直下。
+    """
+    match = DATE_PREFIX.match(slug) or DATE_PREFIX.match(date or "")
+    if not match:
+        return Path(".")
+    return Path(match.group(1)) / match.group(2)
+
+
+def post_path(slug: str, date: str = "", posts_dir: Path = POSTS_DIR) -> Path:
+    """記事ファイルの保存先"""
+    return Path(posts_dir) / shard_for(slug, date) / f"{slug}.md"
+
+
+def manifest_path(posts_dir: Path = POSTS_DIR) -> Path:
+    return Path(posts_dir) / MANIFEST_NAME
+
+
+def scan_posts(posts_dir: Path = POSTS_DIR) -> list:
+    """ディレクトリを走査して記事ファイルを列挙（直下と年/月の2階層）"""
+    posts_dir = Path(posts_dir)
+    if not posts_dir.exists():
+        return []
+    return sorted(
+        list(posts_dir.glob("*.md")) + list(posts_dir.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9]/*.md")),
+        key=lambda p: p.stem,
+    )
+
+
+def manifest_entry(filepath: Path, posts_dir: Path = POSTS_DIR, raw: str = None) -> dict:
+    """記事1件のマニフェストエントリ（hashはrender_cache / posts.tsと同じSHA-256、sizeはファイルのバイト数）"""
+    filepath = Path(filepath)
+    if raw is None:
+        raw = filepath.read_text(encoding='utf-8')
+    metadata, _ = parse_frontmatter(raw)
+    return {
+        "path": filepath.relative_to(posts_dir).as_posix(),
+        "hash": hashlib.sha256(raw.encode('utf-8')).hexdigest(),
+        "size": filepath.stat().st_size,
+        "date": metadata.get('date') or filepath.stem,
+        "title": metadata.get('title', filepath.stem),
+        "category": metadata.get('category', ''),
+    }
+
+
+def build_manifest(posts_dir: Path = POSTS_DIR) -> dict:
+    """走査して slug → エントリ を作成"""
+    posts_dir = Path(posts_dir)
+    return {path.stem: manifest_entry(path, posts_dir) for path in scan_posts(posts_dir)}
+
+
+def shard_dirs(posts_dir: Path = POSTS_DIR) -> list:
+    """記事を置くディレクトリ（posts直下と年/月）"""
+    posts_dir = Path(posts_dir)
+    return [posts_dir] + sorted(p for p in posts_dir.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9]") if p.is_dir())
+
+
+def _is_modified(path: Path, entry: dict, stamp: int) -> bool:
+    """記事ファイルが stamp 以降に書き換えられたか（更新時刻かサイズで判定）"""
+    stat = path.stat()
+    return stat.st_mtime_ns >= stamp or stat.st_size != entry.get("size")
+
+
+def refresh_manifest(posts: dict, posts_dir: Path, stamp: int) -> dict:
+    """stamp（マニフェストの更新時刻, ns）以降に変わった記事を反映する
+
+    ファイルの追加・削除・置き換え（git checkoutやCMSの保存）はディレクトリの
+    更新時刻を進めるので、古いディレクトリは一覧を取り直さない。
+    その場での編集はディレクトリの更新時刻を変えないため、記事ごとに
+    ファイルの更新時刻とサイズを確認し、変わったものだけ開いてハッシュを取る。
+    """
+    posts_dir = Path(posts_dir)
+    directories = shard_dirs(posts_dir)
+    shards = {directory.relative_to(posts_dir).as_posix() for directory in directories}
+
+    # 年/月ディレクトリごと消えた記事
+    for slug in [s for s, e in posts.items() if Path(e["path"]).parent.as_posix() not in shards]:
+        del posts[slug]
+
+    for directory in directories:
+        shard = directory.relative_to(posts_dir).as_posix()
+        if directory.stat().st_mtime_ns >= stamp:
+            current = {path.stem: path for path in directory.glob("*.md")}
+            for slug in [s for s, e in posts.items() if Path(e["path"]).parent.as_posix() == shard]:
+                if slug not in current:
+                    del posts[slug]
+        else:
+            current = {
+                slug: posts_dir / entry["path"] for slug, entry in posts.items()
+                if Path(entry["path"]).parent.as_posix() == shard
+            }
+        for slug, path in current.items():
+            entry = posts.get(slug)
+            if entry is None or entry["path"] != path.relative_to(posts_dir).as_posix() \
+                    or _is_modified(path, entry, stamp):
+                posts[slug] = manifest_entry(path, posts_dir)
+    return posts
+
+
+def load_manifest(posts_dir: Path = POSTS_DIR) -> dict:
+    """マニフェストの slug → エントリ（古いディレクトリは走査し直す。ない・壊れている場合は作成）"""
+    path = manifest_path(posts_dir)
+    if path.exists():
+        try:
+            stamp = path.stat().st_mtime_ns
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                return refresh_manifest(data["posts"], posts_dir, stamp)
+        except (OSError, ValueError, KeyError):
+            pass
+    return build_manifest(posts_dir)
+
+
+def save_manifest(posts: dict, posts_dir: Path = POSTS_DIR):
+    path = manifest_path(posts_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "posts": posts}, f,
+                  ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def record_post(filepath: Path, posts_dir: Path = POSTS_DIR, raw: str = None):
+    """保存した記事をマニフェストに反映"""
+    posts = load_manifest(posts_dir)
+    posts[Path(filepath).stem] = manifest_entry(filepath, posts_dir, raw)
+    save_manifest(posts, posts_dir)
+
+
+def sorted_entries(posts: dict, newest_first: bool = False) -> list:
+    """(slug, エントリ) を日付順に並べる"""
+    return sorted(posts.items(), key=lambda item: (item[1]["date"], item[0]), reverse=newest_first)
+
+
+def iter_post_files(posts_dir: Path = POSTS_DIR) -> list:
+    """全記事ファイルのパス（スラッグ順）"""
+    posts_dir = Path(posts_dir)
+    posts = load_manifest(posts_dir)
+    return [posts_dir / posts[slug]["path"] for slug in sorted(posts)]
+
+
+def find_post(slug: str, posts_dir: Path = POSTS_DIR) -> Path:
+    """スラッグから記事ファイルのパスを返す（なければNone）"""
+    entry = load_manifest(posts_dir).get(slug)
+    return Path(posts_dir) / entry["path"] if entry else None
+
+
+def posts_between(start: str, end: str, posts_dir: Path = POSTS_DIR) -> list:
+    """日付が start〜end（YYYY-MM-DD、両端含む）の (slug, エントリ) を日付順に返す"""
+    return [
+        (slug, entry) for slug, entry in sorted_entries(load_manifest(posts_dir))
+        if start <= entry["date"][:10] <= end
+    ]
+
+
+def migrate(posts_dir: Path = POSTS_DIR, dry_run: bool = False) -> dict:
+    """フラット配置の記事を年/月ディレクトリへ移動し、マニフェストを作り直す"""
+    posts_dir = Path(posts_dir)
+    counts = {"moved": 0, "kept": 0, "conflicts": 0}
+
+    for path in scan_posts(posts_dir):
+        metadata, _ = parse_frontmatter(path.read_text(encoding='utf-8'))
+        target = post_path(path.stem, metadata.get('date', ''), posts_dir)
+        if target == path:
+            counts["kept"] += 1
+            continue
+        if target.exists():
+            print(f"⚠️ 移動先に同名の記事があります: {target.relative_to(posts_dir)}")
+            counts["conflicts"] += 1
+            continue
+
+        print(f"📦 {path.relative_to(posts_dir)} → {target.relative_to(posts_dir)}")
+        if not dry_run:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            path.rename(target)
+        counts["moved"] += 1
+
+    if not dry_run:
+        save_manifest(build_manifest(posts_dir), posts_dir)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="記事の年/月配置とマニフェストを管理")
+    parser.add_argument("--migrate", action="store_true", help="フラット配置の記事を年/月ディレクトリへ移動")
+    parser.add_argument("--refresh", action="store_true", help="変わった記事だけマニフェストに反映")
+    parser.add_argument("--rebuild", action="store_true", help="走査してマニフェストを作り直す")
+    parser.add_argument("--dry-run", action="store_true", help="移動せずに内容だけ表示")
+    parser.add_argument("--site", type=Path, help="サイト設定ファイル（既定: scripts/sites/ennek.json）")
+    parser.add_argument("--posts-dir", type=Path, help="記事ディレクトリ（既定: サイトの content/posts）")
+    args = parser.parse_args()
+
+    site = load_site(args.site) if args.site else DEFAULT_SITE
+    posts_dir = args.posts_dir or site.posts_dir
+
+    print("=" * 50)
+    print("🗂️ 記事ストレージ")
+    print("=" * 50)
+
+    if args.migrate:
+        counts = migrate(posts_dir, dry_run=args.dry_run)
+        print(f"   移動: {counts['moved']}件{'（ドライラン）' if args.dry_run else ''}")
+        print(f"   配置済み: {counts['kept']}件")
+        print(f"   衝突: {counts['conflicts']}件")
+    elif args.refresh:
+        posts = load_manifest(posts_dir)
+        save_manifest(posts, posts_dir)
+        print(f"   マニフェスト: {len(posts)}件")
+    elif args.rebuild:
+        posts = build_manifest(posts_dir)
+        save_manifest(posts, posts_dir)
+        print(f"   マニフェスト: {len(posts)}件")
+    else:
+        parser.print_help()
+        return 0
+
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
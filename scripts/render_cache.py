@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+記事レンダリングキャッシュ
+- Markdown記事を事前にHTMLへ変換してJSONで保存（remark + remark-html と同じHTML、markdown_html.py）
+- コンテンツハッシュで変更検出（未変更の記事はスキップ）
+- 見出しアンカーID・目次・文字数・読了時間を同梱
+- ビルド時（src/lib/posts.ts）はハッシュ一致時にこのキャッシュを使用
+
+使い方:
+    python scripts/render_cache.py          # 変更のある記事のみ再生成
+    python scripts/render_cache.py --force  # 全記事を再生成
+    python scripts/render_cache.py --site scripts/sites/other.json  # 別サイトの記事
+"""
+
+import re
+import sys
+import json
+import math
+import hashlib
+import argparse
+from pathlib import Path
+
+import markdown_html
+from markdown_html import UnsupportedMarkdown
+from sync_to_obsidian import parse_frontmatter
+from post_store import iter_post_files
+from site_config import DEFAULT_SITE, load_site
+
+# パス設定（scripts/sites/ennek.json）
+PROJECT_ROOT = Path(__file__).parent.parent
+POSTS_DIR = DEFAULT_SITE.posts_dir
+RENDER_CACHE_DIR = DEFAULT_SITE.render_cache_dir
+
+# レンダラーの仕様を変えたら上げる（既存キャッシュを無効化、posts.tsの値も揃える）
+RENDER_VERSION = 2
+
+# 読了時間の目安（日本語: 1分あたりの文字数 / 英語: 1分あたりの単語数）
+CHARS_PER_MINUTE = 500
+WORDS_PER_MINUTE = 200
+
+# 目次に含める見出しレベル（TableOfContents.tsxと同じ h2/h3）
+OUTLINE_LEVELS = (2, 3)
+
+
+# =============================================================================
+# 見出しアンカー
+# =============================================================================
+
+def slugify_heading(text: str) -> str:
+    """見出しテキストからアンカーIDを生成（TableOfContents.tsxと同じ規則）"""
+    slug = re.sub(r'[^a-z0-9\u3040-\u309f\u30a0-\u30ff\u4e00-\u9faf]+', '-', text.lower())
+    return slug.strip('-')
+
+
+def _strip_inline_markup(text: str) -> str:
+    """インライン記法を除去してプレーンテキストにする"""
+    text = re.sub(r'!?\[([^\]]*)\]\([^)]*\)', r'\1', text)
+    text = re.sub(r'(\*\*|__|\*|_|`)', '', text)
+    return text.strip()
+
+
+# =============================================================================
+# Markdown → HTML
+# =============================================================================
+
+def render_markdown(body: str) -> tuple:
+    """Markdown本文をHTMLに変換し、(html, 見出しリスト) を返す
+
+    HTMLは remark + remark-html と同じ（見出しにアンカーIDを付ける点だけが違う）。
+    remarkと同じ出力を保証できない記法を含む場合は UnsupportedMarkdown。
+    """
+    return markdown_html.render(body, slugify_heading)
+
+
+# =============================================================================
+# 統計情報
+# =============================================================================
+
+def compute_text_stats(body: str) -> dict:
+    """プレーンテキストの文字数・単語数・読了時間（分）を計算"""
+    text = re.sub(r'^\s*(#{1,6}|[-*+]|\d+[.)]|>|\|)\s*', '', body, flags=re.MULTILINE)
+    text = _strip_inline_markup(text)
+
+    char_count = len(re.sub(r'\s', '', text))
+    # 英数字は単語単位、日本語は文字単位で数える
+    latin_words = re.findall(r"[A-Za-z0-9][A-Za-z0-9'\-]*", text)
+    cjk_chars = re.findall(r'[\u3040-\u309f\u30a0-\u30ff\u4e00-\u9faf]', text)
+    word_count = len(latin_words) + len(cjk_chars)
+
+    minutes = len(cjk_chars) / CHARS_PER_MINUTE + len(latin_words) / WORDS_PER_MINUTE
+    return {
+        "wordCount": word_count,
+        "charCount": char_count,
+        "readingTime": max(1, math.ceil(minutes)),
+    }
+
+
+# =============================================================================
+# キャッシュ
+# =============================================================================
+
+def content_hash(raw: str) -> str:
+    """記事ファイル全体のSHA-256（posts.tsと同じ計算方法）"""
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def cache_path_for(slug: str, cache_dir: Path = RENDER_CACHE_DIR) -> Path:
+    """スラッグに対応するキャッシュファイルのパス"""
+    return Path(cache_dir) / f"{slug}.json"
+
+
+def load_render_cache(slug: str, cache_dir: Path = RENDER_CACHE_DIR) -> dict:
+    """キャッシュを読み込む（存在しない・壊れている場合は空）"""
+    path = cache_path_for(slug, cache_dir)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_render_entry(slug: str, raw: str) -> dict:
+    """記事の生テキストからキャッシュエントリを作成"""
+    _, body = parse_frontmatter(raw)
+    try:
+        rendered, headings = render_markdown(body)
+    except UnsupportedMarkdown:
+        # HTMLは持たず、ビルド時に remark でレンダリングさせる
+        rendered, headings = None, []
+    entry = {
+        "slug": slug,
+        "hash": content_hash(raw),
+        "version": RENDER_VERSION,
+        "html": rendered,
+        "headings": [h for h in headings if h["level"] in OUTLINE_LEVELS],
+    }
+    entry.update(compute_text_stats(body))
+    return entry
+
+
+def update_render_cache(filepath: Path, force: bool = False,
+                        cache_dir: Path = RENDER_CACHE_DIR) -> bool:
+    """記事1件のキャッシュを更新（変更があった場合のみ書き込み、書き込んだらTrue）"""
+    filepath = Path(filepath)
+    slug = filepath.stem
+    with open(filepath, 'r', encoding='utf-8') as f:
+        raw = f.read()
+
+    cached = load_render_cache(slug, cache_dir)
+    if (
+        not force
+        and cached.get("hash") == content_hash(raw)
+        and cached.get("version") == RENDER_VERSION
+    ):
+        return False
+
+    entry = build_render_entry(slug, raw)
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    with open(cache_path_for(slug, cache_dir), 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False, indent=2)
+    return True
+
+
+def rebuild_render_cache(force: bool = False, posts_dir: Path = POSTS_DIR,
+                         cache_dir: Path = RENDER_CACHE_DIR) -> dict:
+    """全記事のキャッシュを再構築し、件数を返す"""
+    counts = {"updated": 0, "skipped": 0, "removed": 0, "failed": 0}
+    slugs = set()
+
+    for post_file in iter_post_files(posts_dir):
+        slugs.add(post_file.stem)
+        try:
+            if update_render_cache(post_file, force=force, cache_dir=cache_dir):
+                print(f"✅ レンダリング: {post_file.name}")
+                counts["updated"] += 1
+            else:
+                counts["skipped"] += 1
+        except Exception as e:
+            print(f"⚠️ エラー ({post_file.name}): {e}")
+            counts["failed"] += 1
+
+    # 削除された記事のキャッシュを掃除
+    cache_dir = Path(cache_dir)
+    if cache_dir.exists():
+        for cache_file in cache_dir.glob("*.json"):
+            if cache_file.stem not in slugs:
+                cache_file.unlink()
+                counts["removed"] += 1
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="記事レンダリングキャッシュを再構築")
+    parser.add_argument("--force", action="store_true", help="未変更の記事も再生成する")
+    parser.add_argument("--site", type=Path, help="サイト設定ファイル（既定: scripts/sites/ennek.json）")
+    args = parser.parse_args()
+
+    site = load_site(args.site) if args.site else DEFAULT_SITE
+
+    print("=" * 50)
+    print("🧱 レンダリングキャッシュを再構築")
+    print("=" * 50)
+
+    counts = rebuild_render_cache(force=args.force, posts_dir=site.posts_dir,
+                                  cache_dir=site.render_cache_dir)
+
+    print()
+    print("=" * 50)
+    print(f"✨ 完了！")
+    print(f"   更新: {counts['updated']}件")
+    print(f"   スキップ: {counts['skipped']}件")
+    print(f"   削除: {counts['removed']}件")
+    print(f"   エラー: {counts['failed']}件")
+    print(f"   保存先: {site.render_cache_dir}")
+    print("=" * 50)
+
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
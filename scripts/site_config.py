@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+サイト設定の読み込み
+- scripts/sites/*.json に1サイト1ファイルで定義
+  （URL・出力先・カテゴリ・テーマ・プロンプト・サブテーマ）
+- 読み込みは1プロセスにつき1回（パス単位でキャッシュ）
+- 相対パスはプロジェクトルート基準で解決し、派生パスも事前に計算
+- 出力先の既定値はサイト名から決め（sites/{name}/...）、サイト間で重なれば読み込み時にエラー
+- 後半パート用のシステムプロンプトも読み込み時に生成しておく
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+# パス設定
+PROJECT_ROOT = Path(__file__).parent.parent
+SITES_DIR = PROJECT_ROOT / "scripts" / "sites"
+DEFAULT_SITE_FILE = SITES_DIR / "ennek.json"
+
+# 後半パートのシステムプロンプトに差し込む指示
+PART2_PROMPT_MARKER = "見出しはMarkdown形式"
+PART2_PROMPT_INSERT = "記事の後半部分を書いてください。前半部分との一貫性を保ってください。\n\n"
+
+REQUIRED_KEYS = ("name", "blog_url", "category_order", "categories")
+
+# サイトごとに分ける必要がある出力先（ディレクトリとファイル）
+OUTPUT_PATHS = (
+    "content_dir", "images_dir", "obsidian_vault_path",
+    "history_file", "image_index_file", "theme_schedule_file", "generation_stats_file",
+)
+
+
+def _resolve(value: str) -> Path:
+    path = Path(value).expanduser()
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+class SiteConfig:
+    """1サイト分の設定（読み込み後は変更しない）"""
+
+    def __init__(self, data: dict, source: Path = None):
+        missing = [key for key in REQUIRED_KEYS if key not in data]
+        if missing:
+            raise ValueError(f"サイト設定に必須項目がありません ({source}): {', '.join(missing)}")
+
+        self.source = source
+        self.name = data["name"]
+        self.display_name = data.get("display_name", self.name)
+        self.blog_url = data["blog_url"].rstrip("/")
+
+        # 出力先（未指定ならサイト名のディレクトリに分ける）
+        self.content_dir = _resolve(data.get("content_dir", f"sites/{self.name}/content"))
+        self.posts_dir = self.content_dir / "posts"
+        self.render_cache_dir = self.content_dir / "cache" / "render"
+        self.images_dir = _resolve(data.get("images_dir", f"sites/{self.name}/public/images"))
+        self.image_manifest_file = self.content_dir / "image_manifest.json"
+        self.history_file = _resolve(data.get("history_file", f"scripts/{self.name}_history.json"))
+        self.image_index_file = _resolve(data.get("image_index_file", f"scripts/{self.name}_image_index.json"))
+        self.theme_schedule_file = _resolve(data.get("theme_schedule_file", f"scripts/{self.name}_theme_schedule.json"))
+        self.generation_stats_file = _resolve(data.get("generation_stats_file", f"scripts/{self.name}_generation_stats.json"))
+        vault = data.get("obsidian_vault_path")
+        self.obsidian_vault_path = _resolve(vault) if vault else None
+
+        # カテゴリ
+        self.category_order = list(data["category_order"])
+        self.sub_themes = list(data.get("sub_themes", []))
+        self.categories = data["categories"]
+        for key in self.category_order:
+            if key not in self.categories:
+                raise ValueError(f"category_order のカテゴリが未定義です ({source}): {key}")
+        for category in self.categories.values():
+            category["system_prompt_part2"] = category["system_prompt"].replace(
+                PART2_PROMPT_MARKER, PART2_PROMPT_INSERT + PART2_PROMPT_MARKER
+            )
+
+    def category_for_date(self, date) -> str:
+        """日付に基づいてカテゴリを決定（ローテーション）"""
+        day_of_year = date.timetuple().tm_yday
+        return self.category_order[day_of_year % len(self.category_order)]
+
+    def output_paths(self) -> dict:
+        """出力先の 項目名 → 絶対パス（未設定の項目は除く）"""
+        return {
+            key: getattr(self, key).resolve()
+            for key in OUTPUT_PATHS if getattr(self, key) is not None
+        }
+
+    def __repr__(self):
+        return f"SiteConfig({self.name!r})"
+
+
+def _overlaps(a: Path, b: Path) -> bool:
+    return a == b or a in b.parents or b in a.parents
+
+
+def check_sites(sites: list) -> list:
+    """同じサイトの重複や、サイト間で出力先が重なっていないか確認（問題があればValueError）"""
+    for i, site in enumerate(sites):
+        for other in sites[:i]:
+            if site.source == other.source:
+                raise ValueError(f"同じサイト設定が重複しています: {site.source}")
+            if site.name == other.name:
+                raise ValueError(f"サイト名が重複しています: {site.name} ({other.source}, {site.source})")
+            for key, path in site.output_paths().items():
+                for other_key, other_path in other.output_paths().items():
+                    if _overlaps(path, other_path):
+                        raise ValueError(
+                            f"サイトの出力先が重なっています: "
+                            f"{other.name}.{other_key} ({other_path}) と {site.name}.{key} ({path})"
+                        )
+    return sites
+
+
+@lru_cache(maxsize=None)
+def _load_resolved(path: Path) -> SiteConfig:
+    with open(path, 'r', encoding='utf-8') as f:
+        return SiteConfig(json.load(f), source=path)
+
+
+def load_site(path: Path = DEFAULT_SITE_FILE) -> SiteConfig:
+    """サイト設定を読み込む（同じファイルは2回目以降キャッシュを返す）"""
+    return _load_resolved(Path(path).resolve())
+
+
+def load_all_sites() -> list:
+    """scripts/sites にある全サイトの設定（出力先の重なりを確認済み）"""
+    return check_sites([load_site(path) for path in sorted(SITES_DIR.glob("*.json"))])
+
+
+DEFAULT_SITE = load_site()
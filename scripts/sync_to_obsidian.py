@@ -2,19 +2,30 @@
 """
 ブログ記事をObsidian Vaultに同期するスクリプト
 GitHubリポジトリの記事をローカルのObsidian Vaultにコピーします
+
+使い方:
+    python scripts/sync_to_obsidian.py
+    python scripts/sync_to_obsidian.py --site scripts/sites/other.json  # 別サイトの記事
 """
 
 import os
 import re
 import shutil
+import argparse
 from pathlib import Path
 from datetime import datetime
 
-# パス設定
+from site_config import DEFAULT_SITE, SiteConfig, load_site
+from pipeline_logging import LOG_DIR, get_logger, setup_logging, log_stage
+from pipeline_profiling import add_profile_argument, enable_profiling_from_args
+
+logger = get_logger("sync.obsidian")
+
+# パス設定（scripts/sites/ennek.json）
 PROJECT_ROOT = Path(__file__).parent.parent
-POSTS_DIR = PROJECT_ROOT / "content" / "posts"
-OBSIDIAN_VAULT_PATH = Path("/Users/keiji/Desktop/Obsidian/06_blog")
-BLOG_URL = "https://ennekrelationship.netlify.app"
+POSTS_DIR = DEFAULT_SITE.posts_dir
+OBSIDIAN_VAULT_PATH = DEFAULT_SITE.obsidian_vault_path
+BLOG_URL = DEFAULT_SITE.blog_url
 
 
 def parse_frontmatter(content: str) -> tuple:
@@ -41,7 +52,7 @@ def parse_frontmatter(content: str) -> tuple:
     return metadata, body
 
 
-def convert_to_obsidian_format(filepath: Path) -> tuple:
+def convert_to_obsidian_format(filepath: Path, site: SiteConfig = DEFAULT_SITE) -> tuple:
     """ブログ記事をObsidian形式に変換"""
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
@@ -56,13 +67,9 @@ def convert_to_obsidian_format(filepath: Path) -> tuple:
     category_name = metadata.get('categoryName', '人間関係')
     slug = filepath.stem
     
-    # カテゴリに応じたタグを設定
-    category_tags = {
-        'relationship': '人間関係',
-        'health': '健康',
-        'exercise': '運動'
-    }
-    tag = category_tags.get(category, '人間関係')
+    # カテゴリに応じたタグを設定（未知のカテゴリは先頭カテゴリのタグ）
+    category_config = site.categories.get(category) or site.categories[site.category_order[0]]
+    tag = category_config["tag"]
     
     # Obsidian用フロントマター
     obsidian_frontmatter = f"""---
@@ -75,7 +82,7 @@ tags:
   - ブログ
   - {tag}
   - 自動生成
-blogUrl: "{BLOG_URL}/blog/{slug}"
+blogUrl: "{site.blog_url}/blog/{slug}"
 synced: "{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 ---
 
@@ -87,36 +94,45 @@ synced: "{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     return title, date, full_content
 
 
-def sync_articles():
-    """記事をObsidian Vaultに同期"""
-    print("=" * 50)
-    print("📚 ブログ記事をObsidian Vaultに同期")
-    print("=" * 50)
+def sync_articles(posts_dir: Path = None, site: SiteConfig = DEFAULT_SITE):
+    """記事をObsidian Vaultに同期（posts_dir省略時はリポジトリ内のサイトの記事）"""
+    posts_dir = Path(posts_dir) if posts_dir else site.posts_dir
+    vault_path = site.obsidian_vault_path
+    
+    logger.info("=" * 50)
+    logger.info("📚 ブログ記事をObsidian Vaultに同期")
+    logger.info("=" * 50)
     
     # ディレクトリ確認
-    if not POSTS_DIR.exists():
-        print(f"❌ 記事ディレクトリが見つかりません: {POSTS_DIR}")
+    if not posts_dir.exists():
+        logger.error(f"❌ 記事ディレクトリが見つかりません: {posts_dir}")
+        return
+    if vault_path is None:
+        logger.error(f"❌ obsidian_vault_path が設定されていません: {site.source}")
         return
     
-    OBSIDIAN_VAULT_PATH.mkdir(parents=True, exist_ok=True)
+    vault_path.mkdir(parents=True, exist_ok=True)
     
     # 既存のObsidian記事を確認
     existing_files = set()
-    for f in OBSIDIAN_VAULT_PATH.glob("*.md"):
+    for f in vault_path.glob("*.md"):
         existing_files.add(f.stem)
     
     # 記事を同期
     synced_count = 0
     skipped_count = 0
     
-    for post_file in sorted(POSTS_DIR.glob("*.md")):
+    # 記事の一覧はマニフェストから取得（年/月ディレクトリを走査しない）
+    from post_store import iter_post_files
+    
+    for post_file in iter_post_files(posts_dir):
         try:
-            title, date, content = convert_to_obsidian_format(post_file)
+            title, date, content = convert_to_obsidian_format(post_file, site)
             
             # ファイル名を生成
             safe_title = title.replace('/', '').replace('\\', '').replace(':', '').replace('*', '').replace('?', '').replace('"', '').replace('<', '').replace('>', '').replace('|', '')
             filename = f"{date}_{safe_title[:50]}.md"
-            dest_path = OBSIDIAN_VAULT_PATH / filename
+            dest_path = vault_path / filename
             
             # 既に存在する場合はスキップ（上書きしない）
             if dest_path.exists():
@@ -127,20 +143,37 @@ def sync_articles():
             with open(dest_path, 'w', encoding='utf-8') as f:
                 f.write(content)
             
-            print(f"✅ 同期: {filename}")
+            logger.info(f"✅ 同期: {filename}")
             synced_count += 1
             
         except Exception as e:
-            print(f"⚠️ エラー ({post_file.name}): {e}")
+            logger.warning(f"⚠️ エラー ({post_file.name}): {e}")
+    
+    logger.info("")
+    logger.info("=" * 50)
+    logger.info(f"✨ 同期完了！")
+    logger.info(f"   新規同期: {synced_count}件")
+    logger.info(f"   スキップ: {skipped_count}件")
+    logger.info(f"   保存先: {vault_path}")
+    logger.info("=" * 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ブログ記事をObsidian Vaultに同期")
+    parser.add_argument("--site", type=Path, help="サイト設定ファイル（既定: scripts/sites/ennek.json）")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    
+    site = load_site(args.site) if args.site else DEFAULT_SITE
+    
+    setup_logging("sync")
+    profile_dir = enable_profiling_from_args(args.profile, LOG_DIR, "sync")
+    if profile_dir:
+        logger.info(f"🔬 プロファイル出力先: {profile_dir}")
     
-    print()
-    print("=" * 50)
-    print(f"✨ 同期完了！")
-    print(f"   新規同期: {synced_count}件")
-    print(f"   スキップ: {skipped_count}件")
-    print(f"   保存先: {OBSIDIAN_VAULT_PATH}")
-    print("=" * 50)
+    with log_stage(logger, "obsidian"):
+        sync_articles(site=site)
 
 
 if __name__ == "__main__":
-    sync_articles()
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+テーマローテーションスケジューラー
+- カテゴリごとに「テーマ × サブテーマ」の巡回順を事前に決定
+- 投稿履歴に一度でも出たテーマは選ばない（重複による再生成を防止）
+- 同じベーステーマは直近 THEME_SPACING 回以内に再登場させない
+- 巡回位置（カーソル）を保存し、翌日はその続きから選ぶ
+- 全組み合わせを使い切った後は、最も古く使われたテーマから再利用
+
+使い方:
+    python scripts/theme_scheduler.py --plan 30   # 今日から30日分の予定を表示
+"""
+
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# パス設定
+PROJECT_ROOT = Path(__file__).parent.parent
+SCHEDULE_FILE = PROJECT_ROOT / "scripts" / "theme_schedule.json"
+
+# 同じベーステーマを再び使うまでに空ける回数（カテゴリ内）
+THEME_SPACING = 10
+
+
+def combine_theme(theme: str, sub_theme: str) -> str:
+    """テーマとサブテーマを結合（generate_articleの表記と同じ）"""
+    return f"{theme}（{sub_theme}）"
+
+
+class ThemeScheduler:
+    """カテゴリごとのテーマ巡回を管理するクラス"""
+
+    def __init__(self, categories: dict, sub_themes: list, state: dict = None,
+                 schedule_file: Path = SCHEDULE_FILE):
+        self.categories = categories
+        self.sub_themes = sub_themes
+        self.schedule_file = Path(schedule_file)
+        # カテゴリ → {"cursor": 次に調べる巡回位置}
+        self.state = state or {}
+        self._rotations = {}
+        self._bases = {}
+
+    @classmethod
+    def load(cls, categories: dict, sub_themes: list,
+             schedule_file: Path = SCHEDULE_FILE) -> "ThemeScheduler":
+        """保存済みのカーソルを読み込む"""
+        schedule_file = Path(schedule_file)
+        state = {}
+        if schedule_file.exists():
+            try:
+                with open(schedule_file, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                state = {}
+        return cls(categories, sub_themes, state, schedule_file)
+
+    def save(self):
+        """カーソルを保存"""
+        self.schedule_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.schedule_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    def rotation(self, category_key: str) -> list:
+        """巡回順の (テーマ, ベーステーマ) リスト
+
+        1巡目はベーステーマそのまま、2巡目以降はサブテーマ付き。
+        同じ巡内でもテーマごとにサブテーマをずらし、全組み合わせを網羅する。
+        """
+        if category_key not in self._rotations:
+            themes = self.categories[category_key]["themes"]
+            order = [(theme, theme) for theme in themes]
+            for round_index in range(len(self.sub_themes)):
+                for i, theme in enumerate(themes):
+                    sub = self.sub_themes[(round_index + i) % len(self.sub_themes)]
+                    order.append((combine_theme(theme, sub), theme))
+            self._rotations[category_key] = order
+        return self._rotations[category_key]
+
+    def _base_of(self, category_key: str, theme: str) -> str:
+        """テーマからサブテーマを除いたベーステーマ"""
+        if category_key not in self._bases:
+            self._bases[category_key] = dict(self.rotation(category_key))
+        return self._bases[category_key].get(theme) or theme.split("（")[0]
+
+    def candidates(self, category_key: str, history: list):
+        """重複しない候補テーマを優先順に返すジェネレーター"""
+        rotation = self.rotation(category_key)
+        category_history = [
+            item.get('theme', '') for item in history
+            if item.get('category') == category_key
+        ]
+        used = set(category_history)
+        recent_bases = {
+            self._base_of(category_key, theme)
+            for theme in category_history[-THEME_SPACING:]
+        }
+
+        # 1. カーソル位置から巡回順に、未使用かつ間隔を満たすテーマ
+        cursor = self.state.get(category_key, {}).get("cursor", 0) % len(rotation)
+        yielded = set()
+        for offset in range(len(rotation)):
+            theme, base = rotation[(cursor + offset) % len(rotation)]
+            if theme not in used and base not in recent_bases:
+                yielded.add(theme)
+                yield theme
+
+        # 2. 全組み合わせを使い切った場合は、最後に使われたのが古い順（1.で返したものは除く）
+        last_used = {theme: i for i, theme in enumerate(category_history)}
+        for theme, base in sorted(rotation, key=lambda c: last_used.get(c[0], -1)):
+            if theme not in yielded and base not in recent_bases:
+                yield theme
+
+    def next_theme(self, category_key: str, history: list, skip: int = 0) -> str:
+        """skip番目の候補テーマを返す（再試行ごとに別のテーマになる）"""
+        for i, theme in enumerate(self.candidates(category_key, history)):
+            if i == skip:
+                return theme
+        # 候補がない（テーマ数が間隔より少ない）場合は巡回順のまま
+        rotation = self.rotation(category_key)
+        cursor = self.state.get(category_key, {}).get("cursor", 0)
+        return rotation[(cursor + skip) % len(rotation)][0]
+
+    def record(self, category_key: str, theme: str):
+        """テーマの使用を記録し、カーソルをその次へ進める"""
+        rotation = self.rotation(category_key)
+        for index, (candidate, _) in enumerate(rotation):
+            if candidate == theme:
+                self.state[category_key] = {"cursor": (index + 1) % len(rotation)}
+                return
+
+    def plan(self, start: datetime, days: int, history: list, category_for_date) -> list:
+        """start から days 日分の (日付, カテゴリ, テーマ) を計画（状態は変更しない）"""
+        simulated = ThemeScheduler(
+            self.categories, self.sub_themes, json.loads(json.dumps(self.state)),
+            self.schedule_file,
+        )
+        simulated._rotations = self._rotations
+        simulated._bases = self._bases
+        history = list(history)
+
+        schedule = []
+        for day in range(days):
+            date = start + timedelta(days=day)
+            category_key = category_for_date(date)
+            theme = simulated.next_theme(category_key, history)
+            simulated.record(category_key, theme)
+            history.append({"theme": theme, "category": category_key})
+            schedule.append((date.strftime("%Y-%m-%d"), category_key, theme))
+        return schedule
+
+
+def main():
+    parser = argparse.ArgumentParser(description="テーマのローテーション予定を表示")
+    parser.add_argument("--plan", type=int, default=14, help="表示する日数（既定: 14）")
+    parser.add_argument("--site", type=Path, help="サイト設定ファイル（既定: scripts/sites/ennek.json）")
+    args = parser.parse_args()
+
+    from site_config import DEFAULT_SITE, load_site
+
+    site = load_site(args.site) if args.site else DEFAULT_SITE
+    history = []
+    if site.history_file.exists():
+        with open(site.history_file, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    scheduler = ThemeScheduler.load(site.categories, site.sub_themes, site.theme_schedule_file)
+
+    print("=" * 50)
+    print(f"🗓️ テーマ予定（{site.display_name}・{args.plan}日分）")
+    print("=" * 50)
+    for date_str, category_key, theme in scheduler.plan(
+        datetime.now(), args.plan, history, site.category_for_date
+    ):
+        print(f"{date_str} [{site.categories[category_key]['name']}] {theme}")
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
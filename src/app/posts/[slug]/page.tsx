@@ -1,4 +1,5 @@
 import { getPostData, getAllPostSlugs } from '@/lib/posts';
+import TableOfContents from '@/components/TableOfContents';
 import Image from 'next/image';
 import Link from 'next/link';
 import { format } from 'date-fns';
@@ -71,6 +72,11 @@ export default async function Post({ params }: Props) {
               <span className="text-sm text-[var(--color-muted)]">
                 {post.charCount.toLocaleString()}文字
               </span>
+              {post.readingTime && (
+                <span className="text-sm text-[var(--color-muted)]">
+                  約{post.readingTime}分で読めます
+                </span>
+              )}
             </div>
             <h1 className="text-3xl md:text-4xl font-bold leading-tight mb-6">
               {post.title}
@@ -93,6 +99,13 @@ export default async function Post({ params }: Props) {
             )}
           </header>
 
+          {/* 目次（見出しのアンカーは事前レンダリング済みのHTMLにのみ付く） */}
+          {post.headings && post.headings.length > 0 && (
+            <div className="mb-12 opacity-0 animate-fade-in-up animate-delay-200">
+              <TableOfContents headings={post.headings} />
+            </div>
+          )}
+
           {/* 記事本文 */}
           <div 
             className="article-content opacity-0 animate-fade-in-up animate-delay-200"
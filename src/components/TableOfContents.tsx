@@ -11,14 +11,16 @@ interface TOCItem {
 }
 
 interface TableOfContentsProps {
-  content: PortableTextBlock[]
+  content?: PortableTextBlock[]
+  // 事前レンダリング済みの目次（scripts/render_cache.py）があれば再解析しない
+  headings?: TOCItem[]
 }
 
-export default function TableOfContents({ content }: TableOfContentsProps) {
+export default function TableOfContents({ content = [], headings: prebuiltHeadings }: TableOfContentsProps) {
   const [activeId, setActiveId] = useState<string>('')
 
   // 見出しを抽出
-  const headings: TOCItem[] = content
+  const headings: TOCItem[] = prebuiltHeadings ?? content
     .filter(
       (block) =>
         block._type === 'block' &&
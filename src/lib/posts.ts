@@ -1,10 +1,32 @@
 import fs from 'fs';
 import path from 'path';
+import crypto from 'crypto';
 import matter from 'gray-matter';
 import { remark } from 'remark';
 import html from 'remark-html';
 
 const postsDirectory = path.join(process.cwd(), 'content/posts');
+// scripts/post_store.py が管理する記事一覧（slug → 年/月ディレクトリ内のパス）
+const manifestPath = path.join(postsDirectory, 'manifest.json');
+// scripts/render_cache.py が生成する事前レンダリング結果
+const renderCacheDirectory = path.join(process.cwd(), 'content/cache/render');
+// render_cache.py の RENDER_VERSION と揃える（出力形式が変わったら両方を上げる）
+const RENDER_VERSION = 2;
+
+export interface PostHeading {
+  id: string;
+  text: string;
+  level: number;
+}
+
+interface RenderCache {
+  hash: string;
+  version: number;
+  // remarkと同じ出力を保証できない記法を含む記事はnull（remarkでレンダリング）
+  html: string | null;
+  headings: PostHeading[];
+  readingTime: number;
+}
 
 export interface PostData {
   slug: string;
@@ -16,21 +38,85 @@ export interface PostData {
   photoLink: string;
   charCount: number;
   contentHtml?: string;
+  headings?: PostHeading[];
+  readingTime?: number;
   excerpt?: string;
 }
 
-export function getSortedPostsData(): PostData[] {
-  // content/postsディレクトリが存在しない場合
+interface PostManifestEntry {
+  path: string;
+  hash: string;
+  date: string;
+  title: string;
+  category: string;
+}
+
+let postManifest: Record<string, PostManifestEntry> | null = null;
+
+// マニフェストがない場合のみディレクトリを走査（直下と年/月の2階層）
+function scanPostFiles(): Record<string, PostManifestEntry> {
+  const entries: Record<string, PostManifestEntry> = {};
+  const addFiles = (relativeDir: string) => {
+    for (const fileName of fs.readdirSync(path.join(postsDirectory, relativeDir))) {
+      if (fileName.endsWith('.md')) {
+        const slug = fileName.replace(/\.md$/, '');
+        entries[slug] = { path: path.posix.join(relativeDir, fileName), hash: '', date: '', title: '', category: '' };
+      }
+    }
+  };
+
+  addFiles('.');
+  for (const year of fs.readdirSync(postsDirectory).filter((name) => /^\d{4}$/.test(name))) {
+    for (const month of fs.readdirSync(path.join(postsDirectory, year)).filter((name) => /^\d{2}$/.test(name))) {
+      addFiles(`${year}/${month}`);
+    }
+  }
+  return entries;
+}
+
+// 記事一覧はマニフェストから取得（ビルド中は1回だけ読み込む）
+function loadPostManifest(): Record<string, PostManifestEntry> {
+  if (postManifest) {
+    return postManifest;
+  }
   if (!fs.existsSync(postsDirectory)) {
-    return [];
+    return {};
   }
 
-  const fileNames = fs.readdirSync(postsDirectory);
-  const allPostsData = fileNames
-    .filter((fileName) => fileName.endsWith('.md'))
-    .map((fileName) => {
-      const slug = fileName.replace(/\.md$/, '');
-      const fullPath = path.join(postsDirectory, fileName);
+  try {
+    postManifest = JSON.parse(fs.readFileSync(manifestPath, 'utf8')).posts;
+  } catch {
+    postManifest = scanPostFiles();
+  }
+  return postManifest!;
+}
+
+function postFilePath(slug: string): string {
+  const entry = loadPostManifest()[slug];
+  return path.join(postsDirectory, entry ? entry.path : `${slug}.md`);
+}
+
+// 記事の内容ハッシュとキャッシュの形式が一致する場合のみキャッシュを返す
+function readRenderCache(slug: string, fileContents: string): RenderCache | null {
+  const cachePath = path.join(renderCacheDirectory, `${slug}.json`);
+  if (!fs.existsSync(cachePath)) {
+    return null;
+  }
+
+  try {
+    const cache: RenderCache = JSON.parse(fs.readFileSync(cachePath, 'utf8'));
+    const hash = crypto.createHash('sha256').update(fileContents, 'utf8').digest('hex');
+    return cache.version === RENDER_VERSION && cache.hash === hash ? cache : null;
+  } catch {
+    return null;
+  }
+}
+
+export function getSortedPostsData(): PostData[] {
+  const manifest = loadPostManifest();
+  const allPostsData = Object.entries(manifest)
+    .map(([slug, entry]) => {
+      const fullPath = path.join(postsDirectory, entry.path);
       const fileContents = fs.readFileSync(fullPath, 'utf8');
       const matterResult = matter(fileContents);
 
@@ -65,36 +151,31 @@ export function getSortedPostsData(): PostData[] {
 }
 
 export function getAllPostSlugs() {
-  if (!fs.existsSync(postsDirectory)) {
-    return [];
-  }
-
-  const fileNames = fs.readdirSync(postsDirectory);
-  return fileNames
-    .filter((fileName) => fileName.endsWith('.md'))
-    .map((fileName) => {
-      return {
-        params: {
-          slug: fileName.replace(/\.md$/, ''),
-        },
-      };
-    });
+  return Object.keys(loadPostManifest()).map((slug) => {
+    return {
+      params: {
+        slug,
+      },
+    };
+  });
 }
 
 export async function getPostData(slug: string): Promise<PostData> {
-  const fullPath = path.join(postsDirectory, `${slug}.md`);
+  const fullPath = postFilePath(slug);
   const fileContents = fs.readFileSync(fullPath, 'utf8');
   const matterResult = matter(fileContents);
 
-  // MarkdownをHTMLに変換
-  const processedContent = await remark()
-    .use(html)
-    .process(matterResult.content);
-  const contentHtml = processedContent.toString();
+  // 未変更の記事は事前レンダリング結果を使い、なければMarkdownをHTMLに変換
+  const cache = readRenderCache(slug, fileContents);
+  const contentHtml = cache?.html
+    ?? (await remark().use(html).process(matterResult.content)).toString();
 
   return {
     slug,
     contentHtml,
+    // 見出しのアンカーは事前レンダリング済みのHTMLにのみ付く
+    headings: cache?.html ? cache.headings : undefined,
+    readingTime: cache?.readingTime,
     title: matterResult.data.title || '',
     date: matterResult.data.date || '',
     theme: matterResult.data.theme || '',
@@ -0,0 +1,28 @@
+-- Markdown記事（content/posts）をpostsテーブルに取り込むための拡張
+-- scripts/sync_to_supabase.py が slug をキーにupsertする
+
+-- UUID拡張機能の有効化（念のため）
+create extension if not exists "uuid-ossp";
+
+-- 取り込み用カラムの追加
+alter table public.posts add column if not exists slug text;
+alter table public.posts add column if not exists body text;
+alter table public.posts add column if not exists theme text;
+alter table public.posts add column if not exists category text;
+alter table public.posts add column if not exists char_count int;
+alter table public.posts add column if not exists content_hash text;
+alter table public.posts add column if not exists updated_at timestamptz default now();
+
+-- upsertの衝突キー（管理画面から作成した記事はslugがnullのまま）
+create unique index if not exists posts_slug_key
+  on public.posts (slug);
+
+-- sitemap.ts / blog/page.tsx の「公開記事を新しい順」クエリ用
+create index if not exists posts_published_created_at_idx
+  on public.posts (created_at desc)
+  where is_draft = false;
+
+-- カテゴリ別一覧用
+create index if not exists posts_category_created_at_idx
+  on public.posts (category, created_at desc)
+  where is_draft = false;
@@ -23,6 +23,11 @@ create table if not exists public.posts (
   created_at timestamptz default now()
 );
 
+-- 公開記事を新しい順に取得するクエリ（sitemap / ブログ一覧）用
+create index if not exists posts_published_created_at_idx
+  on public.posts (created_at desc)
+  where is_draft = false;
+
 -- Tags table
 create table if not exists public.tags (
   id uuid primary key default uuid_generate_v4(),
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# スクリプトは scripts/ をカレントにして実行される前提のため、同じ import パスにする
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
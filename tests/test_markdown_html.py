@@ -0,0 +1,88 @@
+"""markdown_html の出力が remark + remark-html と一致すること
+
+期待値は remark().use(html).process(markdown) の出力（見出しの id 属性だけを追加したもの）。
+"""
+
+import pytest
+
+from markdown_html import UnsupportedMarkdown, render
+from render_cache import slugify_heading
+
+
+def html(markdown: str) -> str:
+    return render(markdown, slugify_heading)[0]
+
+
+REMARK_CASES = [
+    # 緩いリスト（項目の間に空行）は1つの <ol> にまとまり、各項目を <p> で包む
+    (
+        "1. 一つ目\n\n2. 二つ目\n\n3. 三つ目\n",
+        "<ol>\n<li>\n<p>一つ目</p>\n</li>\n<li>\n<p>二つ目</p>\n</li>\n<li>\n<p>三つ目</p>\n</li>\n</ol>\n",
+    ),
+    # 詰まったリスト
+    ("- a\n- b\n", "<ul>\n<li>a</li>\n<li>b</li>\n</ul>\n"),
+    # 番号の開始値
+    ("3. x\n4. y\n", '<ol start="3">\n<li>x</li>\n<li>y</li>\n</ol>\n'),
+    # インデントなしの継続行（遅延継続）は項目内の段落の続き
+    (
+        "1. **見出し**  \n本文の続き\n\n2. 次\n",
+        "<ol>\n<li>\n<p><strong>見出し</strong><br>\n本文の続き</p>\n</li>\n<li>\n<p>次</p>\n</li>\n</ol>\n",
+    ),
+    # 番号付き項目の内容位置（3桁目）に届かない入れ子はリストを分ける
+    (
+        "1. item\n  - sub\n2. next\n",
+        '<ol>\n<li>item</li>\n</ol>\n<ul>\n<li>sub</li>\n</ul>\n<ol start="2">\n<li>next</li>\n</ol>\n',
+    ),
+    # 入れ子のリスト
+    (
+        "- **悪い例**：\n  - あなた\n\n- **良い例**：\n  - わたし\n",
+        "<ul>\n<li>\n<p><strong>悪い例</strong>：</p>\n<ul>\n<li>あなた</li>\n</ul>\n</li>\n"
+        "<li>\n<p><strong>良い例</strong>：</p>\n<ul>\n<li>わたし</li>\n</ul>\n</li>\n</ul>\n",
+    ),
+    # 段落直後の --- は見出し（setext）、単独なら水平線
+    ("本文\n---\n", '<h2 id="本文">本文</h2>\n'),
+    ("前\n\n---\n\n後\n", "<p>前</p>\n<hr>\n<p>後</p>\n"),
+    # 句読点の後の ** は閉じられない（左右フランキング規則）
+    ("**「強調」**の例\n", "<p>**「強調」**の例</p>\n"),
+    ("**強調**。\n", "<p><strong>強調</strong>。</p>\n"),
+    # 改行・エスケープ
+    ("a  \nb\nc\n", "<p>a<br>\nb\nc</p>\n"),
+    ("A & B < C\n", "<p>A &#x26; B &#x3C; C</p>\n"),
+    # GFMなしのテーブルは段落
+    ("| a | b |\n|---|---|\n", "<p>| a | b |\n|---|---|</p>\n"),
+    # リンクのURL正規化と安全でないプロトコルの除去
+    (
+        '[日本](https://example.com/日本 "題")\n',
+        '<p><a href="https://example.com/%E6%97%A5%E6%9C%AC" title="題">日本</a></p>\n',
+    ),
+    ("[x](javascript:alert(1))\n", "<p><a>x</a></p>\n"),
+    # 引用とコード
+    ("> q\n> r\n", "<blockquote>\n<p>q\nr</p>\n</blockquote>\n"),
+    ("```js\nx < 1\n```\n", '<pre><code class="language-js">x &#x3C; 1\n</code></pre>\n'),
+    ("`a & b`\n", "<p><code>a &#x26; b</code></p>\n"),
+]
+
+
+@pytest.mark.parametrize("markdown, expected", REMARK_CASES)
+def test_matches_remark(markdown, expected):
+    assert html(markdown) == expected
+
+
+def test_heading_anchors_and_outline():
+    rendered, headings = render("## はじめに\n\n## はじめに\n\n### **詳しく**\n", slugify_heading)
+    assert rendered == (
+        '<h2 id="はじめに">はじめに</h2>\n'
+        '<h2 id="はじめに-2">はじめに</h2>\n'
+        '<h3 id="詳しく"><strong>詳しく</strong></h3>\n'
+    )
+    assert [h["text"] for h in headings] == ["はじめに", "はじめに", "詳しく"]
+
+
+@pytest.mark.parametrize("markdown", [
+    "<div>生のHTML</div>\n",
+    "本文 <span>タグ</span>\n",
+    "[参照]\n\n[参照]: https://example.com\n",
+])
+def test_unsupported_syntax_is_rejected(markdown):
+    with pytest.raises(UnsupportedMarkdown):
+        html(markdown)
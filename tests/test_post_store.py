@@ -0,0 +1,51 @@
+import os
+
+from post_store import load_manifest, post_path, save_manifest
+
+
+def write_post(posts_dir, slug, body):
+    path = post_path(slug, posts_dir=posts_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\ntitle: \"{slug}\"\ndate: \"{slug}\"\n---\n\n{body}\n", encoding="utf-8")
+    return path
+
+
+def age(path, seconds=60):
+    """更新時刻を過去にずらす（マニフェストより古いファイル・ディレクトリにする）"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+def test_in_place_edit_is_rehashed(tmp_path):
+    path = write_post(tmp_path, "2026-01-10", "本文")
+    save_manifest(load_manifest(tmp_path), tmp_path)
+    before = load_manifest(tmp_path)["2026-01-10"]["hash"]
+
+    # 追記してもディレクトリの更新時刻は変わらない
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("追記\n")
+    age(path.parent)
+
+    assert load_manifest(tmp_path)["2026-01-10"]["hash"] != before
+
+
+def test_same_size_edit_with_old_directory_is_rehashed(tmp_path):
+    path = write_post(tmp_path, "2026-01-10", "本文A")
+    save_manifest(load_manifest(tmp_path), tmp_path)
+    before = load_manifest(tmp_path)["2026-01-10"]["hash"]
+
+    path.write_text(path.read_text(encoding="utf-8").replace("本文A", "本文B"), encoding="utf-8")
+    age(path.parent)
+
+    assert load_manifest(tmp_path)["2026-01-10"]["hash"] != before
+
+
+def test_removed_month_directory_drops_posts(tmp_path):
+    path = write_post(tmp_path, "2025-12-21", "本文")
+    write_post(tmp_path, "2026-01-10", "本文")
+    save_manifest(load_manifest(tmp_path), tmp_path)
+
+    path.unlink()
+    path.parent.rmdir()
+
+    assert sorted(load_manifest(tmp_path)) == ["2026-01-10"]
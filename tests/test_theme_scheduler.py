@@ -0,0 +1,40 @@
+from theme_scheduler import ThemeScheduler, combine_theme
+
+CATEGORIES = {
+    "relationship": {"themes": [f"テーマ{i}" for i in range(12)]},
+}
+SUB_THEMES = ["最新研究から見る"]
+
+
+def make_scheduler(tmp_path):
+    return ThemeScheduler(CATEGORIES, SUB_THEMES, schedule_file=tmp_path / "schedule.json")
+
+
+def history_except(scheduler, unused: set) -> list:
+    """unused 以外の組み合わせを巡回順に使い切った履歴"""
+    return [
+        {"theme": theme, "category": "relationship"}
+        for theme, _ in scheduler.rotation("relationship")
+        if theme not in unused
+    ]
+
+
+def test_candidates_do_not_repeat_unused_themes(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    unused = {combine_theme(f"テーマ{i}", SUB_THEMES[0]) for i in range(3)}
+    history = history_except(scheduler, unused)
+
+    candidates = list(scheduler.candidates("relationship", history))
+
+    assert len(candidates) == len(set(candidates))
+    assert set(candidates[:len(unused)]) == unused
+
+
+def test_retries_pick_different_themes(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    unused = {combine_theme(f"テーマ{i}", SUB_THEMES[0]) for i in range(3)}
+    history = history_except(scheduler, unused)
+
+    themes = [scheduler.next_theme("relationship", history, skip=attempt) for attempt in range(4)]
+
+    assert len(set(themes)) == 4